@@ -1,13 +1,25 @@
-from flask import Flask, request, render_template, jsonify, session, redirect, url_for, flash, send_file
+from flask import Flask, request, render_template, jsonify, session, redirect, url_for, flash, send_file, Response
 import pandas as pd
 import os
 import json
 import logging
+import shutil
 from datetime import datetime, date
 import threading
+import time
+import uuid
+from functools import partial
 from werkzeug.utils import secure_filename
-from scraper import StudentResultScraper
+from scraper import StudentResultScraper, get_driver_pool
 from data_analyzer import DataAnalyzer
+from result_writer import checkpoint_path_for, export_checkpoint, job_output_path
+from job_store import JobStore
+from job_runner import run_scrape_job, run_claimed_job, progress_from_job
+from range_planner import RangeError, SeriesTracker, parse_range_list
+from progress_events import ProgressBroker, event_stream
+from prepared_json import PreparedJson
+from job_registry import JobRegistry
+from job_admission import AdmissionRejected, JobScheduler
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -20,7 +32,7 @@ app = Flask(__name__)
 app.secret_key = os.environ["SESSION_SECRET"]
 
 # Configuration
-UPLOAD_FOLDER = 'uploads'
+UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
 ALLOWED_EXTENSIONS = {'xlsx', 'xls', 'csv'}
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
 
@@ -30,9 +42,103 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Global variables for progress tracking
-scraping_progress_data= {}
-analysis_progress = {}
+# 'thread' scrapes inside this process; 'queue' only enqueues jobs for worker.py processes
+SCRAPE_MODE = os.environ.get('SCRAPE_MODE', 'thread')
+QUEUE_MODE = SCRAPE_MODE == 'queue'
+
+# Consecutive missing roll numbers after which the rest of a range is skipped (0 scrapes everything)
+DEFAULT_MISS_LIMIT = int(os.environ.get('RANGE_MISS_LIMIT', 5))
+
+# Jobs of each kind run at once in this process; further ones wait their turn, up to MAX_QUEUED_JOBS
+MAX_ACTIVE_SCRAPES = int(os.environ.get('MAX_ACTIVE_SCRAPES', 2))
+MAX_ACTIVE_ANALYSES = int(os.environ.get('MAX_ACTIVE_ANALYSES', 2))
+MAX_QUEUED_JOBS = int(os.environ.get('MAX_QUEUED_JOBS', 50))
+
+# Chrome instances all scrape jobs together may use, and the most one job may hold, so a
+# single-student lookup can run beside a large range instead of waiting for it to finish
+CHROME_BUDGET = int(os.environ.get('CHROME_BUDGET', os.environ.get('DRIVER_POOL_SIZE', 3)))
+BROWSERS_PER_JOB = int(os.environ.get('BROWSERS_PER_JOB', 2))
+
+# Scrape jobs of at most this many roll numbers are queued ahead of larger ones
+PRIORITY_JOB_SIZE = int(os.environ.get('PRIORITY_JOB_SIZE', 10))
+
+# Recent jobs remembered in each user's session
+MAX_SESSION_JOBS = 20
+
+# Fields the analysis page offers to compare student groups by; other headers of the sheet can be named too
+GROUP_FIELDS = ('Branch', 'Section', 'Program')
+MAX_GROUP_COLUMNS = 5
+
+# Start pooled Chrome drivers in the background so the first job scrapes immediately
+if not QUEUE_MODE and os.environ.get('DRIVER_POOL_WARMUP', '1') == '1':
+    threading.Thread(target=get_driver_pool().warm_up, daemon=True).start()
+
+# Wakes the Server-Sent Events streams of a job whenever its progress changes
+progress_events = ProgressBroker()
+SCRAPE_ACTIVE_STATUSES = ('queued', 'starting', 'scraping', 'saving')
+ANALYSIS_ACTIVE_STATUSES = ('queued', 'starting', 'analyzing')
+
+# Progress tracking, bounded so finished jobs don't accumulate in memory.
+# Evicted scrape progress is rebuilt from the job store; finished analyses
+# are spilled to JOB_SPILL_DIR when it is set.
+scraping_progress_data = JobRegistry('scrape', SCRAPE_ACTIVE_STATUSES, on_evict=progress_events.discard)
+analysis_progress = JobRegistry('analysis', ANALYSIS_ACTIVE_STATUSES, on_evict=progress_events.discard)
+
+# Scrape jobs are also persisted so they can be resumed after a restart
+job_store = JobStore()
+
+scrape_scheduler = JobScheduler('scrape', MAX_ACTIVE_SCRAPES, MAX_QUEUED_JOBS, budget=CHROME_BUDGET)
+analysis_scheduler = JobScheduler('analysis', MAX_ACTIVE_ANALYSES, MAX_QUEUED_JOBS)
+
+def new_job_id(kind):
+    """Job id that stays unique however many jobs start in the same second"""
+    return f"{kind}_{uuid.uuid4().hex}"
+
+def remember_job(kind, job_id):
+    """Add a job to the user's session, which is what grants access to its progress"""
+    jobs = [j for j in session.get(f'{kind}_jobs', []) if j != job_id] + [job_id]
+    session[f'{kind}_jobs'] = jobs[-MAX_SESSION_JOBS:]
+
+def owns_job(kind, job_id):
+    return job_id in session.get(f'{kind}_jobs', [])
+
+def scrape_priority(total):
+    return 0 if total <= PRIORITY_JOB_SIZE else 1
+
+def scrape_ticket(engine, total):
+    """
+    Scheduling terms of a scrape job: small lookups first, and a share of the Chrome budget.
+    API engines hand failed lookups to Selenium, so they hold one browser for the fallback.
+    """
+    return {
+        'priority': scrape_priority(total),
+        'cost': min(BROWSERS_PER_JOB, total) if engine == 'selenium' else 1,
+        'work': total,
+        'work_kind': engine,
+    }
+
+def update_queue_position(progress, job_id, position):
+    """Scheduler callback: keep a waiting job's place in the queue in its progress"""
+    if position:
+        progress['queue_position'] = position
+    else:
+        progress.pop('queue_position', None)
+    progress_events.publish(job_id)
+
+def get_scrape_progress(session_id):
+    """Progress of a scrape job, from memory when it runs here, otherwise from the job store"""
+    if session_id in scraping_progress_data:
+        progress = scraping_progress_data[session_id]
+        if progress.get('status') == 'queued':
+            return {**progress, 'estimated_start_in': scrape_scheduler.estimated_start(session_id)}
+        return progress
+    job = job_store.get_job(session_id)
+    if job is None:
+        return None
+    progress = progress_from_job(job, UPLOAD_FOLDER)
+    if job['status'] == 'queued':
+        progress['queue_position'] = job_store.queue_position(session_id)
+    return progress
 
 def allowed_file(filename):
     """Check if uploaded file has allowed extension"""
@@ -71,6 +177,12 @@ def scrape_results():
         choice = request.form.get('choice')
         filename = request.form.get('filename', 'student_results')
         selected_columns = request.form.getlist('columns')  # Get selected columns
+        engine = request.form.get('engine', 'selenium')
+        force_refresh = request.form.get('force_refresh') == 'on'
+        
+        if engine not in StudentResultScraper.ENGINES:
+            flash('Invalid scraping engine selected.', 'error')
+            return redirect(url_for('index'))
         
         if not filename or not filename.strip():
             filename = 'student_results'
@@ -79,6 +191,8 @@ def scrape_results():
             filename += '.xlsx'
         
         all_roll_numbers = []
+        series = []
+        miss_limit = 0
         
         # Process roll numbers based on choice
         if choice == 'single':
@@ -91,48 +205,79 @@ def scrape_results():
         elif choice == 'range':
             rollno_from = request.form.get('from', '').strip()
             rollno_to = request.form.get('to', '').strip()
+            more_ranges = request.form.get('ranges', '').strip()
             
-            if not rollno_from or not rollno_to:
+            if bool(rollno_from) != bool(rollno_to) or not (rollno_from or more_ranges):
                 flash('Please provide both From and To roll numbers.', 'error')
                 return redirect(url_for('index'))
             
             try:
-                # Extract numeric parts for range generation
-                start_num = int(rollno_from[-2:])
-                end_num = int(rollno_to[-2:])
-                base_rollno = rollno_from[:-2]
-                
-                if start_num > end_num:
-                    flash('From roll number must be less than or equal to To roll number.', 'error')
-                    return redirect(url_for('index'))
-                
-                # Generate roll numbers in range
-                for i in range(start_num, end_num + 1):
-                    all_roll_numbers.append(f"{base_rollno}{str(i).zfill(2)}")
-                    
-            except (ValueError, IndexError):
+                # From/To plus any extra sections, each probed as its own series
+                spec = f"{rollno_from}-{rollno_to}\n{more_ranges}" if rollno_from else more_ranges
+                series = parse_range_list(spec)
+                miss_limit = int(request.form.get('miss_limit') or DEFAULT_MISS_LIMIT)
+            except RangeError as e:
+                flash(f'Invalid roll number range: {e}', 'error')
+                return redirect(url_for('index'))
+            except ValueError:
                 flash('Invalid roll number format. Please check your input.', 'error')
                 return redirect(url_for('index'))
+            
+            all_roll_numbers = [roll_number for rolls in series for roll_number in rolls]
         else:
             flash('Invalid choice selected.', 'error')
             return redirect(url_for('index'))
         
         # Generate unique session ID for progress tracking
-        session_id = f"scrape_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        session['scraping_session_id'] = session_id
-        scraping_progress_data[session_id] = {
+        session_id = new_job_id('scrape')
+        
+        if QUEUE_MODE:
+            # A worker process picks the job up; progress is read back from the job store
+            job_store.create_job(session_id, all_roll_numbers, filename, selected_columns, engine,
+                                 force_refresh=force_refresh, queued=True,
+                                 series_sizes=[len(rolls) for rolls in series], miss_limit=miss_limit,
+                                 priority=scrape_priority(len(all_roll_numbers)))
+            remember_job('scrape', session_id)
+            session['scraping_session_id'] = session_id
+            return redirect(url_for('scraping_progress'))
+        
+        progress = {
             'total': len(all_roll_numbers),
             'completed': 0,
-            'status': 'starting',
-            'filename': filename
+            'status': 'queued',
+            'filename': filename,
+            'selected_columns': selected_columns
         }
+        scraping_progress_data[session_id] = progress
+        try:
+            scrape_scheduler.enqueue(session_id, partial(update_queue_position, progress, session_id),
+                                     **scrape_ticket(engine, len(all_roll_numbers)))
+        except AdmissionRejected as e:
+            del scraping_progress_data[session_id]
+            logging.warning(f"Rejected scrape job: {str(e)}")
+            flash('The server is busy with other scraping jobs. Please try again in a few minutes.', 'error')
+            return redirect(url_for('index'))
         
-        # Start scraping in background thread
-        scraper = StudentResultScraper()
-        threading.Thread(
-            target=run_scraping_task,
-            args=(scraper, all_roll_numbers, filename, session_id, selected_columns)
-        ).start()
+        try:
+            job_store.create_job(session_id, all_roll_numbers, filename, selected_columns, engine,
+                                 force_refresh=force_refresh,
+                                 series_sizes=[len(rolls) for rolls in series], miss_limit=miss_limit,
+                                 priority=scrape_priority(len(all_roll_numbers)))
+            
+            # Start scraping in background thread
+            tracker = SeriesTracker(series, miss_limit) if series and miss_limit > 0 else None
+            scraper = StudentResultScraper(engine=engine, force_refresh=force_refresh, series_tracker=tracker)
+            threading.Thread(
+                target=run_scraping_task,
+                args=(scraper, all_roll_numbers, filename, session_id, selected_columns)
+            ).start()
+        except Exception:
+            # Don't leave a job that will never run holding up the queue
+            scrape_scheduler.cancel(session_id)
+            scraping_progress_data.pop(session_id, None)
+            raise
+        remember_job('scrape', session_id)
+        session['scraping_session_id'] = session_id
         
         # Redirect to results page to show progress
         return redirect(url_for('scraping_progress'))
@@ -142,39 +287,59 @@ def scrape_results():
         flash(f'An error occurred: {str(e)}', 'error')
         return redirect(url_for('index'))
 
-def run_scraping_task(scraper, roll_numbers, filename, session_id, selected_columns=None):
+def run_scraping_task(scraper, roll_numbers, filename, session_id, selected_columns=None, resume=False):
     """Background task for scraping student results"""
-    try:
-        scraping_progress_data[session_id]['status'] = 'scraping'
-        
-        # Perform scraping with progress callback
-        def progress_callback(completed, total):
-            scraping_progress_data[session_id]['completed'] = completed
-        
-        results = scraper.scrape_parallel(roll_numbers, progress_callback=progress_callback)
-        
-        # Save results to Excel
-        scraping_progress_data[session_id]['status'] = 'saving'
-        output_path = os.path.join(UPLOAD_FOLDER, filename)
-        scraper.save_to_excel(results, output_path, selected_columns=selected_columns)
-        
-        scraping_progress_data[session_id]['status'] = 'completed'
-        scraping_progress_data[session_id]['file_path'] = output_path
-        
-    except Exception as e:
-        logging.error(f"Scraping task error: {str(e)}")
-        scraping_progress_data[session_id]['status'] = 'error'
-        scraping_progress_data[session_id]['error'] = str(e)
+    progress = scraping_progress_data[session_id]
+    # Keep heartbeating while queued so no other process takes the job over as stale
+    with scrape_scheduler.slot(session_id, on_wait=partial(job_store.heartbeat, session_id),
+                               wait_interval=job_store.stale_after / 3) as browsers:
+        # The scraper's limit can't be 0; a job granted no budget has nothing left to scrape
+        scraper.browser_limit = max(1, browsers)
+        run_scrape_job(job_store, scraper, session_id, roll_numbers, filename, UPLOAD_FOLDER,
+                       selected_columns, resume=resume, progress=progress,
+                       on_update=partial(progress_events.publish, session_id))
+
+def run_resumed_job(job):
+    """Background task for a stale job taken over from another process"""
+    with scrape_scheduler.slot(job['id'], on_wait=partial(job_store.heartbeat, job['id']),
+                               wait_interval=job_store.stale_after / 3) as browsers:
+        run_claimed_job(job_store, job, UPLOAD_FOLDER, True, scraping_progress_data[job['id']],
+                        partial(progress_events.publish, job['id']), browser_limit=max(1, browsers))
+
+def resume_stale_jobs():
+    """Pick up scrape jobs left unfinished by a restarted or crashed process"""
+    while True:
+        try:
+            for job in job_store.claim_stale_jobs():
+                progress = {
+                    'total': job['total'],
+                    'completed': job['completed'],
+                    'status': 'queued',
+                    'filename': job['filename'],
+                    'selected_columns': job['selected_columns']
+                }
+                scraping_progress_data[job['id']] = progress
+                # Already accepted once, so never turned away
+                scrape_scheduler.enqueue(job['id'], partial(update_queue_position, progress, job['id']),
+                                         force=True, **scrape_ticket(job['engine'], job['total'] - job['completed']))
+                threading.Thread(target=run_resumed_job, args=(job,), daemon=True).start()
+        except Exception as e:
+            logging.error(f"Error resuming scrape jobs: {str(e)}")
+        time.sleep(job_store.stale_after / 2)
+
+# In queue mode the workers resume stale jobs themselves
+if not QUEUE_MODE:
+    threading.Thread(target=resume_stale_jobs, daemon=True).start()
 
 @app.route('/scraping-progress')
 def scraping_progress():
     """Show scraping progress page"""
-    session_id = session.get('scraping_session_id')
-    if not session_id or session_id not in scraping_progress_data:
+    session_id = request.args.get('job') or session.get('scraping_session_id')
+    progress_data = get_scrape_progress(session_id) if session_id and owns_job('scrape', session_id) else None
+    if progress_data is None:
         flash('No active scraping session found.', 'error')
         return redirect(url_for('index'))
     
-    progress_data = scraping_progress_data[session_id]
     return render_template('results.html', 
                          progress=progress_data, 
                          session_id=session_id,
@@ -183,24 +348,45 @@ def scraping_progress():
 @app.route('/api/scraping-status/<session_id>')
 def get_scraping_status(session_id):
     """API endpoint to get scraping progress status"""
-    if session_id in scraping_progress_data:
-        return jsonify(scraping_progress_data[session_id])
+    progress_data = get_scrape_progress(session_id) if owns_job('scrape', session_id) else None
+    if progress_data is not None:
+        return jsonify(progress_data)
     return jsonify({'status': 'not_found'}), 404
 
+@app.route('/api/scraping-events/<session_id>')
+def scraping_events(session_id):
+    """Server-Sent Events stream of a scrape job's progress"""
+    if not owns_job('scrape', session_id):
+        return jsonify({'status': 'not_found'}), 404
+    
+    def snapshot():
+        progress_data = get_scrape_progress(session_id)
+        return dict(progress_data) if progress_data is not None else None
+    
+    # Jobs run by queue workers only show up in the job store, so check it every second
+    return event_stream_response(event_stream(progress_events, session_id, snapshot, SCRAPE_ACTIVE_STATUSES,
+                                              refresh_interval=1 if QUEUE_MODE else 15))
+
+def event_stream_response(stream):
+    """Stream Server-Sent Events without buffering by proxies"""
+    return Response(stream, mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/progress/<session_id>')
 def get_progress(session_id):
-    return jsonify(scraping_progress_data.get(session_id, {
+    progress_data = get_scrape_progress(session_id) if owns_job('scrape', session_id) else None
+    return jsonify(progress_data or {
         'status': 'unknown',
         'completed': 0,
         'total': 0
-    }))
+    })
 
 
 @app.route('/analyze', methods=['GET', 'POST'])
 def analyze_data():
     """Handle data analysis requests"""
     if request.method == 'GET':
-        return render_template('analyze.html')
+        return render_template('analyze.html', group_fields=GROUP_FIELDS)
     
     try:
         # Check if file was uploaded
@@ -217,25 +403,48 @@ def analyze_data():
             flash('Invalid file type. Please upload Excel or CSV files only.', 'error')
             return redirect(url_for('analyze_data'))
         
-        # Save uploaded file
+        # Save the upload in a folder of its own, so another upload with the same name
+        # can't replace it while this analysis waits in the queue
+        session_id = new_job_id('analysis')
         filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        file_path = os.path.join(app.config['UPLOAD_FOLDER'], session_id, filename)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
         file.save(file_path)
         
-        # Generate unique session ID for analysis
-        session_id = f"analyze_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        session['analysis_session_id'] = session_id
-        analysis_progress[session_id] = {
-            'status': 'starting',
+        # Breakdowns for the group comparison: each selected field alone, optionally also together.
+        # Nothing selected (e.g. the dashboard's upload form) leaves the analyzer's defaults.
+        group_fields = [field for field in request.form.getlist('group_by') if field in GROUP_FIELDS]
+        # The analyzer matches these against the sheet's headers and skips any it can't find
+        columns = [name.strip() for name in request.form.get('group_columns', '').split(',') if name.strip()]
+        group_fields += [name for name in dict.fromkeys(columns) if name not in group_fields][:MAX_GROUP_COLUMNS]
+        group_by = [[field] for field in group_fields]
+        if request.form.get('group_combined') == 'on' and len(group_fields) > 1:
+            group_by.append(group_fields)
+        group_by = group_by or None
+        
+        progress = {
+            'status': 'queued',
             'filename': filename,
             'file_path': file_path
         }
+        analysis_progress[session_id] = progress
+        try:
+            analysis_scheduler.enqueue(session_id, partial(update_queue_position, progress, session_id),
+                                       work_kind='analysis')
+        except AdmissionRejected as e:
+            del analysis_progress[session_id]
+            shutil.rmtree(os.path.dirname(file_path), ignore_errors=True)
+            logging.warning(f"Rejected analysis job: {str(e)}")
+            flash('The server is busy with other analyses. Please try again in a few minutes.', 'error')
+            return redirect(url_for('analyze_data'))
+        remember_job('analysis', session_id)
+        session['analysis_session_id'] = session_id
         
         # Start analysis in background thread
         analyzer = DataAnalyzer()
         threading.Thread(
             target=run_analysis_task,
-            args=(analyzer, file_path, session_id)
+            args=(analyzer, file_path, session_id, group_by)
         ).start()
         
         return redirect(url_for('analysis_progress_'))
@@ -245,27 +454,37 @@ def analyze_data():
         flash(f'An error occurred: {str(e)}', 'error')
         return redirect(url_for('analyze_data'))
 
-def run_analysis_task(analyzer, file_path, session_id):
+def run_analysis_task(analyzer, file_path, session_id, group_by=None):
     """Background task for data analysis"""
+    with analysis_scheduler.slot(session_id):
+        analyze_file_task(analyzer, file_path, session_id, group_by)
+
+def analyze_file_task(analyzer, file_path, session_id, group_by=None):
     try:
         analysis_progress[session_id]['status'] = 'analyzing'
+        progress_events.publish(session_id)
         
         # Perform comprehensive analysis
-        results = analyzer.analyze_file(file_path)
+        results = analyzer.analyze_file(file_path, group_by)
         
-        analysis_progress[session_id]['status'] = 'completed'
-        analysis_progress[session_id]['results'] = results
+        # Serialize the results once; status polls and event streams send these bytes as they are.
+        # Replacing the entry lets the registry account for its new size.
+        entry = {**analysis_progress[session_id], 'status': 'completed'}
+        entry['response'] = PreparedJson.from_data(make_json_serializable({**entry, 'results': results}))
+        analysis_progress[session_id] = entry
         
     except Exception as e:
         logging.error(f"Analysis task error: {str(e)}")
         analysis_progress[session_id]['status'] = 'error'
         analysis_progress[session_id]['error'] = str(e)
+    finally:
+        progress_events.publish(session_id)
 
 @app.route('/analysis-progress')
 def analysis_progress_():
     """Show analysis progress page"""
-    session_id = session.get('analysis_session_id')
-    if not session_id or session_id not in analysis_progress:
+    session_id = request.args.get('job') or session.get('analysis_session_id')
+    if not session_id or not owns_job('analysis', session_id) or session_id not in analysis_progress:
         flash('No active analysis session found.', 'error')
         return redirect(url_for('analyze_data'))
     
@@ -280,20 +499,89 @@ def analysis_progress_():
 
 def get_analysis_status(session_id):
     """API endpoint to get analysis progress status"""
-    if session_id in analysis_progress:
-        safe_result = make_json_serializable(analysis_progress)
-        return jsonify(safe_result[session_id])
+    state = analysis_snapshot(session_id) if owns_job('analysis', session_id) else None
+    if state is None:
+        return jsonify({'status': 'not_found'}), 404
+    if isinstance(state, PreparedJson):
+        return state.response()
+    return jsonify(state)
 
-    return jsonify({'status': 'not_found'}), 404
 
+def analysis_snapshot(session_id):
+    """The prepared response of a finished analysis, or the small status dict of one still running"""
+    entry = analysis_progress.get(session_id)
+    if entry is None:
+        return None
+    if entry.get('status') == 'queued':
+        return {**entry, 'estimated_start_in': analysis_scheduler.estimated_start(session_id)}
+    return entry.get('response', entry)
 
-@app.route('/download/<filename>')
-def download_file(filename):
-    """Download generated files"""
+
+@app.route('/api/analysis-events/<session_id>')
+def analysis_events(session_id):
+    """Server-Sent Events stream of an analysis job; the results are sent once, when it completes"""
+    if not owns_job('analysis', session_id):
+        return jsonify({'status': 'not_found'}), 404
+    snapshot = partial(analysis_snapshot, session_id)
+    return event_stream_response(event_stream(progress_events, session_id, snapshot, ANALYSIS_ACTIVE_STATUSES))
+
+
+@app.route('/api/jobs')
+def list_jobs():
+    """The current user's recent jobs, newest first"""
+    jobs = []
+    for job_id in reversed(session.get('scrape_jobs', [])):
+        progress_data = get_scrape_progress(job_id)
+        if progress_data is not None:
+            jobs.append(job_summary('scrape', job_id, progress_data))
+    for job_id in reversed(session.get('analysis_jobs', [])):
+        entry = analysis_progress.get(job_id)
+        if entry is not None:
+            jobs.append(job_summary('analysis', job_id, entry))
+    return jsonify({'jobs': jobs})
+
+
+def job_summary(kind, job_id, progress_data):
+    summary = {'id': job_id, 'kind': kind}
+    for field in ('status', 'filename', 'queue_position', 'completed', 'total', 'error'):
+        if field in progress_data:
+            summary[field] = progress_data[field]
+    return summary
+
+
+@app.route('/api/memory')
+def memory_stats():
+    """Memory held by in-memory job progress and analysis results, plus the process's resident size"""
+    return jsonify({
+        'scraping': scraping_progress_data.stats(),
+        'analysis': analysis_progress.stats(),
+        'rss_bytes': process_rss_bytes(),
+    })
+
+
+def process_rss_bytes():
+    """Resident memory of this process, where /proc is available"""
     try:
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+@app.route('/download/<job_id>')
+def download_file(job_id):
+    """Download a scrape job's workbook, or a snapshot of a running job with ?partial=1"""
+    try:
+        progress_data = get_scrape_progress(job_id) if owns_job('scrape', job_id) else None
+        if progress_data is None:
+            flash('File not found.', 'error')
+            return redirect(url_for('index'))
+        filename = progress_data['filename']
+        file_path = job_output_path(UPLOAD_FOLDER, job_id, filename)
+        if request.args.get('partial'):
+            return download_partial(filename, file_path, progress_data.get('selected_columns'))
         if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True)
+            return send_file(file_path, as_attachment=True, download_name=filename)
         else:
             flash('File not found.', 'error')
             return redirect(url_for('index'))
@@ -302,6 +590,17 @@ def download_file(filename):
         flash('Error downloading file.', 'error')
         return redirect(url_for('index'))
 
+def download_partial(filename, file_path, selected_columns=None):
+    """Export the students scraped so far from a job's checkpoint"""
+    checkpoint_path = checkpoint_path_for(file_path)
+    if not os.path.exists(checkpoint_path):
+        flash('No partial results available yet.', 'error')
+        return redirect(url_for('index'))
+    
+    partial_path = os.path.join(os.path.dirname(file_path), f"partial_{filename}")
+    export_checkpoint(checkpoint_path, partial_path, selected_columns=selected_columns)
+    return send_file(partial_path, as_attachment=True, download_name=f"partial_{filename}")
+
 @app.errorhandler(413)
 def too_large(e):
     """Handle file too large error"""
@@ -0,0 +1,189 @@
+"""
+Asyncio scraping engine that keeps hundreds of roll numbers in flight on one
+core, bounded by a global concurrency limit and per-host token-bucket rate limits
+"""
+
+import asyncio
+import logging
+import os
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+from http_fetcher import HttpResultFetcher, ResultNotFound, reports_no_result
+
+logger = logging.getLogger(__name__)
+
+
+class Skipped(Exception):
+    """A roll number dropped by the caller's skip predicate before it was requested"""
+
+
+class TokenBucket:
+    """Token-bucket rate limiter for coroutines"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            capacity: Maximum burst size, defaults to one second of tokens
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and consume it"""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def refund(self):
+        """Return a token that ended up not being used"""
+        self._tokens = min(self.capacity, self._tokens + 1)
+
+
+class AsyncResultEngine:
+    """Fetch many students concurrently over the results API"""
+
+    def __init__(self, fetcher: Optional[HttpResultFetcher] = None, concurrency: Optional[int] = None,
+                 rate: Optional[float] = None, burst: Optional[float] = None, max_retries: int = 3):
+        """
+        Args:
+            fetcher: Supplies the API URL, headers, timeout and payload parser
+            concurrency: Maximum requests in flight across all hosts
+            rate: Requests per second allowed per host
+            burst: Token-bucket capacity per host
+            max_retries: Attempts per roll number on transient errors
+        """
+        self.fetcher = fetcher or HttpResultFetcher()
+        self.concurrency = concurrency or int(os.environ.get('SCRAPE_CONCURRENCY', 100))
+        self.rate = rate or float(os.environ.get('SCRAPE_RATE_LIMIT', 10))
+        self.burst = burst
+        self.max_retries = max_retries
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    async def fetch_raw(self, session: aiohttp.ClientSession, roll_number: str,
+                        skip: Optional[Callable] = None) -> Dict[str, Any]:
+        """
+        Fetch and normalize one student, retrying transient failures with backoff
+
+        skip is checked once a rate-limit token is granted, i.e. right before
+        the request goes out; Skipped is raised when it accepts the roll number.
+        """
+        url = self.fetcher.api_url
+        bucket = self._bucket_for(url)
+        params = {'rollNo': roll_number, 'examType': 'general'}
+
+        for attempt in range(1, self.max_retries + 1):
+            await bucket.acquire()
+            if skip and skip(roll_number):
+                bucket.refund()
+                raise Skipped(roll_number)
+            try:
+                async with session.get(url, params=params) as response:
+                    try:
+                        payload = await response.json(content_type=None)
+                    except ValueError:
+                        payload = None
+                    if reports_no_result(payload):
+                        raise ResultNotFound(roll_number)
+                    if 400 <= response.status < 500 and response.status != 429:
+                        # Not worth retrying; the roll number is handed to the browser instead
+                        raise ValueError(f"Results API answered HTTP {response.status} for {roll_number}")
+                    response.raise_for_status()
+                return self.fetcher.parse_payload(payload, roll_number)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                backoff = (2 ** attempt) * 0.5 + random.uniform(0, 0.5)
+                logger.warning(f"Request for {roll_number} failed ({e}), retrying in {backoff:.1f}s")
+                await asyncio.sleep(backoff)
+
+    async def fetch_all(self, roll_numbers: List[str], progress_callback: Optional[Callable] = None,
+                        result_callback: Optional[Callable] = None,
+                        skip: Optional[Callable] = None) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        Fetch all roll numbers concurrently
+
+        Args:
+            roll_numbers: Roll numbers to fetch
+            progress_callback: Called with (completed, total) after each roll number
+            result_callback: Called with (roll_number, payload) as each roll number
+                settles, payload being None when the portal has no result;
+                payloads are then not kept in the returned dictionary
+            skip: Predicate checked just before each request; roll numbers it
+                accepts are settled as having no result without being fetched
+
+        Returns:
+            Tuple of (normalized payloads keyed by roll number, roll numbers
+            that failed with a transport or payload error)
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        failed: List[str] = []
+        completed = 0
+        total = len(roll_numbers)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self._buckets = {}  # asyncio primitives are bound to the running loop
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.fetcher.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers=dict(self.fetcher.session.headers)) as session:
+
+            async def fetch_one(roll_number: str):
+                try:
+                    raw = await self.fetch_raw(session, roll_number, skip)
+                    if result_callback:
+                        result_callback(roll_number, raw)
+                    else:
+                        results[roll_number] = raw
+                except ResultNotFound:
+                    logger.warning(f"No data found for roll number: {roll_number}")
+                    if result_callback:
+                        result_callback(roll_number, None)
+                except Skipped:
+                    # Settled like a missing student, without a request
+                    if result_callback:
+                        result_callback(roll_number, None)
+                except Exception as e:
+                    logger.error(f"Async fetch failed for {roll_number}: {e}")
+                    failed.append(roll_number)
+
+            async def worker(roll_number: str):
+                nonlocal completed
+                async with semaphore:
+                    await fetch_one(roll_number)
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total)
+
+            await asyncio.gather(*(worker(roll_number) for roll_number in roll_numbers))
+
+        return results, failed
+
+    def run(self, roll_numbers: List[str], progress_callback: Optional[Callable] = None,
+            result_callback: Optional[Callable] = None,
+            skip: Optional[Callable] = None) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """Blocking wrapper around fetch_all for use from worker threads"""
+        return asyncio.run(self.fetch_all(roll_numbers, progress_callback, result_callback, skip))
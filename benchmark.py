@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Student Result Analysis System
+Run `python benchmark.py <benchmark> --help` for the options of each benchmark
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+def _transferred_bytes(driver) -> int:
+    """Bytes received over the network since the performance log was last read"""
+    total = 0
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message['method'] == 'Network.loadingFinished':
+            total += message['params'].get('encodedDataLength', 0)
+    return total
+
+
+def bench_lean_pages(args):
+    """Per-student wall time and bytes transferred with lean-page mode off and on"""
+    from scraper import StudentResultScraper
+
+    for lean in (False, True):
+        scraper = StudentResultScraper(driver_pool=False, result_cache=False, lean_pages=lean)
+        scraper.request_delay = (0, 0)
+        scraper.chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+        driver = scraper._create_driver()
+        timings, sizes, failures = [], [], 0
+        try:
+            _transferred_bytes(driver)  # discard browser startup traffic
+            for _ in range(args.rounds):
+                for roll_number in args.roll_numbers:
+                    start = time.perf_counter()
+                    try:
+                        scraper._scrape_attempt(roll_number, driver)
+                    except Exception:
+                        failures += 1
+                    timings.append(time.perf_counter() - start)
+                    sizes.append(_transferred_bytes(driver))
+        finally:
+            driver.quit()
+
+        print(f"lean pages {'on ' if lean else 'off'}: "
+              f"{statistics.mean(timings):.2f}s mean / {statistics.median(timings):.2f}s median per student, "
+              f"{statistics.mean(sizes) / 1024:.0f} KiB per student, {failures} failed")
+
+
+GRADES = ('O', 'A+', 'A', 'B+', 'B', 'C', 'F', 'Ab')
+GRADE_WEIGHTS = (10, 18, 22, 20, 14, 8, 6, 2)
+BRANCHES = ('CSE', 'AIML', 'AI', 'ECE', 'EEE', 'MECH')
+
+
+def write_synthetic_results(path: str, students: int, seed: int = 0):
+    """Write an Excel export of made-up students in the scraper's layout (4 semesters, 6 courses each)"""
+    from result_writer import StreamingResultWriter, export_checkpoint
+    from scraper import StudentResult
+
+    rng = random.Random(seed)
+    checkpoint = f"{os.path.splitext(path)[0]}.jsonl"
+    with StreamingResultWriter(checkpoint) as writer:
+        for i in range(students):
+            branch = rng.choice(BRANCHES)
+            semesters = {
+                f"sem{sem}": [{
+                    'Course Name': f"Course {sem}{course:02d}",
+                    'Grade': rng.choices(GRADES, GRADE_WEIGHTS)[0],
+                    'Status': 'P',
+                    'Credits': rng.choice((3, 4)),
+                } for course in range(1, 7)]
+                for sem in range(1, 5)
+            }
+            writer.append(StudentResult(
+                hall_ticket_number=f"23EG1{BRANCHES.index(branch):02d}{chr(65 + i // 1000)}{i % 1000:03d}",
+                student_name=f"Student {i}",
+                program='B.Tech',
+                branch=branch,
+                section=rng.choice('ABC'),
+                cgpa=f"{rng.uniform(4, 10):.2f}",
+                semester_details=semesters,
+                semester_sgpa={f"sem{sem}": f"{rng.uniform(4, 10):.2f}" for sem in range(1, 5)},
+                backlog_count=rng.choice((0, 0, 0, 1, 2)),
+            ))
+    export_checkpoint(checkpoint, path)
+    os.remove(checkpoint)
+
+
+def bench_analysis(args):
+    """Analysis time over a synthetic cohort with every section computed independently vs. the shared pipeline"""
+    from data_analyzer import AnalysisContext, DataAnalyzer
+
+    analyzer = DataAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'results.xlsx')
+        write_synthetic_results(path, args.students)
+        df = analyzer._load_data(path)
+    df.replace(['--', 'NA', 'null', ''], float('nan'), inplace=True)
+    print(f"{args.students} students, {len(df.columns)} columns")
+
+    def independent():
+        # Fresh context per section: columns, CGPA and dependencies re-derived every time
+        for name in analyzer.SECTIONS:
+            analyzer._section(AnalysisContext(df, path), name)
+
+    def shared():
+        analyzer.analyze_dataframe(df, path)
+
+    for label, run in (('independent sections', independent), ('shared pipeline', shared)):
+        timings = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        print(f"{label}: {statistics.mean(timings):.3f}s mean / {min(timings):.3f}s best")
+
+
+def bench_parse(args):
+    """Parse time of synthetic result exports: pandas' two-row header read vs. the sheet loader's engines"""
+    import importlib.util
+
+    import pandas as pd
+    from sheet_loader import load_workbook
+
+    readers = [('pandas header=[0, 1]', lambda path: pd.read_excel(path, header=[0, 1])),
+               ('loader, openpyxl', lambda path: load_workbook(path, engine='openpyxl'))]
+    if importlib.util.find_spec('python_calamine'):
+        readers.append(('loader, calamine', lambda path: load_workbook(path, engine='calamine')))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for students in args.rows:
+            path = os.path.join(tmp, f'results_{students}.xlsx')
+            write_synthetic_results(path, students)
+            print(f"{students} rows, {os.path.getsize(path) / 1024:.0f} KiB")
+            for label, read in readers:
+                timings = []
+                for _ in range(args.rounds):
+                    start = time.perf_counter()
+                    read(path)
+                    timings.append(time.perf_counter() - start)
+                print(f"  {label}: {statistics.mean(timings):.2f}s mean / {min(timings):.2f}s best")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    lean = subparsers.add_parser('lean-pages', help=bench_lean_pages.__doc__)
+    lean.add_argument('roll_numbers', nargs='+', help='Roll numbers to scrape from the live portal')
+    lean.add_argument('--rounds', type=int, default=1, help='Times to scrape each roll number')
+    lean.set_defaults(func=bench_lean_pages)
+
+    analysis = subparsers.add_parser('analysis', help=bench_analysis.__doc__)
+    analysis.add_argument('--students', type=int, default=5000, help='Size of the synthetic cohort')
+    analysis.add_argument('--rounds', type=int, default=5, help='Times to analyze the cohort')
+    analysis.set_defaults(func=bench_analysis)
+
+    parse = subparsers.add_parser('parse', help=bench_parse.__doc__)
+    parse.add_argument('--rows', type=int, nargs='+', default=[1000, 10000], help='Sheet sizes to generate')
+    parse.add_argument('--rounds', type=int, default=3, help='Times to parse each sheet')
+    parse.set_defaults(func=bench_parse)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
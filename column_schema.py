@@ -0,0 +1,105 @@
+"""
+Column schema inference for uploaded result sheets: every header is
+classified once (student identity, CGPA, per-semester SGPA, per-course
+Grade/Status/Credits, backlog count) and the mapping is cached by header
+signature, so repeated uploads of the same export skip the scan entirely
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Identity fields and the header keywords that identify them, checked in order
+IDENTITY_KEYWORDS = (
+    ('roll_number', ('hall ticket', 'roll')),
+    ('name', ('name',)),
+    ('program', ('program',)),
+    ('branch', ('branch',)),
+    ('section', ('section',)),
+)
+
+# '<course>_Grade', '<course> Status', ... as flattened from the two-row export header
+COURSE_DETAIL = re.compile(r'^(?P<course>.+?)[\s_]+(?P<detail>grade|status|credits)$', re.IGNORECASE)
+SEMESTER = re.compile(r'(?<![a-z])sem(?:ester)?[\s_-]*(?P<number>\d+)', re.IGNORECASE)
+
+
+@dataclass
+class ColumnSchema:
+    """
+    What each column of a sheet holds
+
+    Instances are shared between uploads with the same header, so they must
+    not be modified.
+    """
+    identity: Dict[str, str] = field(default_factory=dict)
+    cgpa: Optional[str] = None
+    backlogs: Optional[str] = None
+    sgpa: Dict[int, str] = field(default_factory=dict)
+    courses: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    other: List[str] = field(default_factory=list)
+
+    @cached_property
+    def grade_cols(self) -> List[str]:
+        """Grade column of every course, in sheet order"""
+        return [details['grade'] for details in self.courses.values() if 'grade' in details]
+
+    @cached_property
+    def gpa_cols(self) -> List[str]:
+        """CGPA followed by each semester's SGPA"""
+        return ([self.cgpa] if self.cgpa else []) + list(self.sgpa.values())
+
+    def column_for(self, name: str) -> Optional[str]:
+        """Column of an identity field such as 'Branch' or 'Section'"""
+        return self.identity.get(name.strip().lower().replace(' ', '_'))
+
+
+def _classify(schema: ColumnSchema, col: str):
+    lower = col.lower()
+
+    match = COURSE_DETAIL.match(col)
+    if match:
+        course = schema.courses.setdefault(match.group('course'), {})
+        course.setdefault(match.group('detail').lower(), col)
+        return
+
+    if 'gpa' in lower:
+        semester = SEMESTER.search(col)
+        if semester:
+            schema.sgpa.setdefault(int(semester.group('number')), col)
+            return
+        if 'cgpa' in lower and schema.cgpa is None:
+            schema.cgpa = col
+            return
+
+    if 'backlog' in lower and schema.backlogs is None:
+        schema.backlogs = col
+        return
+
+    for role, keywords in IDENTITY_KEYWORDS:
+        if role not in schema.identity and any(keyword in lower for keyword in keywords):
+            schema.identity[role] = col
+            return
+
+    schema.other.append(col)
+
+
+@lru_cache(maxsize=64)
+def infer_schema(columns: Tuple[str, ...]) -> ColumnSchema:
+    """
+    Classify the columns of a sheet
+
+    Args:
+        columns: The sheet's (flattened) headers, in order; the tuple is the
+            cache key, so sheets with the same header share one schema
+    """
+    schema = ColumnSchema()
+    for col in columns:
+        _classify(schema, col)
+    schema.sgpa = dict(sorted(schema.sgpa.items()))
+    logger.debug(f"Inferred schema for {len(columns)} columns: {len(schema.courses)} courses, "
+                 f"semesters {list(schema.sgpa)}, identity {list(schema.identity)}")
+    return schema
@@ -0,0 +1,125 @@
+"""
+AIMD concurrency control for scraping: parallelism grows by one while the
+portal's p95 latency and timeout rate stay healthy, and halves with an
+exponential, jittered cooldown as soon as either degrades
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 60) -> float:
+    """Exponential backoff with jitter: about base * 2^(attempt-1), capped, randomized by +/-50%"""
+    return min(cap, base * 2 ** max(0, attempt - 1)) * random.uniform(0.5, 1.5)
+
+
+class AdaptiveConcurrency:
+    """Gate limiting how many requests run at once, tuned from observed latency"""
+
+    def __init__(self, initial: int, maximum: int, target_latency: float, minimum: int = 1,
+                 max_timeout_rate: float = 0.1, window: int = 50, base_backoff: float = 2,
+                 max_backoff: float = 60):
+        """
+        Args:
+            initial: Concurrency to start with
+            maximum: Upper bound, usually the number of worker threads
+            target_latency: Highest healthy p95 latency in seconds
+            minimum: Lower bound concurrency never drops below
+            max_timeout_rate: Highest healthy fraction of timed-out requests
+            window: Recent requests the latency and timeout statistics cover
+            base_backoff: Cooldown in seconds after the first unhealthy round
+            max_backoff: Longest cooldown after repeated unhealthy rounds
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.target_latency = target_latency
+        self.max_timeout_rate = max_timeout_rate
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._samples = deque(maxlen=window)
+        self._since_adjust = 0
+        self._strikes = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot and for any cooldown to pass"""
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.time()
+                if wait <= 0 and self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def record(self, latency: float, timed_out: bool = False):
+        """Report one finished request; adjusts the limit once per round of `limit` requests"""
+        with self._cond:
+            # Requests already in flight when the limit was cut say nothing about the new limit
+            if time.time() - latency < self._last_decrease:
+                return
+            self._samples.append((latency, timed_out))
+            self._since_adjust += 1
+            if self._since_adjust >= max(self.limit, 5):
+                self._adjust()
+
+    def _adjust(self):
+        """Additive increase while healthy, multiplicative decrease plus cooldown when not"""
+        p95, timeout_rate = self._p95(), self._timeout_rate()
+        self._since_adjust = 0
+
+        if p95 <= self.target_latency and timeout_rate <= self.max_timeout_rate:
+            self._strikes = 0
+            if self.limit < self.maximum:
+                self.limit += 1
+                logger.info(f"Portal healthy (p95 {p95:.1f}s), raising concurrency to {self.limit}")
+                self._cond.notify_all()
+            return
+
+        self._strikes += 1
+        self.limit = max(self.minimum, self.limit // 2)
+        cooldown = backoff_delay(self._strikes, self.base_backoff, self.max_backoff)
+        self._last_decrease = time.time()
+        self._paused_until = self._last_decrease + cooldown
+        # Start the next round from fresh observations at the new limit
+        self._samples.clear()
+        logger.warning(f"Portal degraded (p95 {p95:.1f}s, {timeout_rate:.0%} timeouts), "
+                       f"lowering concurrency to {self.limit} and pausing {cooldown:.1f}s")
+
+    def _p95(self) -> float:
+        latencies = sorted(latency for latency, _ in self._samples)
+        return latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+
+    def _timeout_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, timed_out in self._samples if timed_out) / len(self._samples)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limit and the latency statistics it is based on"""
+        with self._cond:
+            latencies = sorted(latency for latency, _ in self._samples)
+            return {
+                'current': self.limit,
+                'max': self.maximum,
+                'in_flight': self._in_flight,
+                'p50_latency': round(latencies[len(latencies) // 2], 2) if latencies else None,
+                'p95_latency': round(self._p95(), 2) if latencies else None,
+                'timeout_rate': round(self._timeout_rate(), 3),
+                'paused_for': round(max(0.0, self._paused_until - time.time()), 1),
+            }
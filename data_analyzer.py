@@ -9,7 +9,11 @@ import logging
 from typing import Dict, List, Any, Optional, Union
 import json
 import os
+import time
 from datetime import datetime
+from functools import cached_property
+from column_schema import ColumnSchema, infer_schema
+from sheet_loader import load_workbook
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Set non-GUI backend
@@ -22,27 +26,128 @@ warnings.filterwarnings('ignore')
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Breakdowns reported when the caller doesn't choose any
+DEFAULT_GROUP_BY = [['Branch'], ['Section'], ['Program']]
+
+# Minimum CGPA counted as a pass
+PASS_CGPA = 5.0
+
+
+class AnalysisContext:
+    """
+    A DataFrame under analysis and everything derived from it: the column
+    schema, the numeric CGPA series and finished sections are computed on
+    first use and then shared by every section that needs them
+    """
+    
+    def __init__(self, df: pd.DataFrame, file_path: str = '', group_by: Optional[List[List[str]]] = None):
+        """
+        Args:
+            group_by: Breakdowns to report, each a list of fields (e.g.
+                ['Branch', 'Section']) whose combinations form the groups
+        """
+        self.df = df
+        self.file_path = file_path
+        self.group_by = group_by if group_by is not None else DEFAULT_GROUP_BY
+        self.sections: Dict[str, Any] = {}
+    
+    @cached_property
+    def schema(self) -> ColumnSchema:
+        return infer_schema(tuple(self.df.columns))
+    
+    def column_for(self, field: str) -> Optional[str]:
+        """Column holding a field such as 'Branch': an exact header, an identity field, or a header containing it"""
+        if field in self.df.columns:
+            return field
+        col = self.schema.column_for(field)
+        if col is None:
+            keyword = field.strip().lower()
+            col = next((c for c in self.df.columns if keyword in c.lower()), None)
+        return col
+    
+    @property
+    def cgpa_col(self) -> Optional[str]:
+        return self.schema.cgpa
+    
+    @property
+    def branch_col(self) -> Optional[str]:
+        return self.schema.identity.get('branch')
+    
+    @property
+    def name_col(self) -> Optional[str]:
+        return self.schema.identity.get('name')
+    
+    @property
+    def backlog_col(self) -> Optional[str]:
+        return self.schema.backlogs
+    
+    @property
+    def grade_cols(self) -> List[str]:
+        """Grade column of every course"""
+        return self.schema.grade_cols
+    
+    @cached_property
+    def cgpa(self) -> pd.Series:
+        """Numeric CGPA of every student that has one"""
+        if self.cgpa_col is None:
+            return pd.Series(dtype=float)
+        return pd.to_numeric(self.df[self.cgpa_col], errors='coerce').dropna()
+
+
 class DataAnalyzer:
     """Comprehensive data analyzer for student academic performance"""
     
+    # Result key -> method computing it; sections that build on others fetch them
+    # through _section, so each one runs once per analysis
+    SECTIONS = {
+        'file_info': '_get_file_info',
+        'summary_statistics': '_calculate_summary_statistics',
+        'grade_distribution': '_analyze_grade_distribution',
+        'performance_trends': '_analyze_performance_trends',
+        'branch_comparison': '_analyze_branch_performance',
+        'group_comparison': '_analyze_group_performance',
+        'subject_performance': '_analyze_subject_performance',
+        'student_rankings': '_calculate_student_rankings',
+        'statistical_insights': '_generate_statistical_insights',
+        'detailed_stats': '_generate_detailed_statistics',
+        'recommendations': '_generate_recommendations',
+        'charts': '_prepare_chart_data',
+    }
+    
     def __init__(self):
         self.grade_points = {
             'O':10, 'A+': 9, 'A': 8, 'B+': 7, 'B': 6, 'C': 5, 'F': 0, 'Ab': 0
         }
         self.grade_categories = {
-            'Excellent': ['A+', 'A'],
+            'Excellent': ['O', 'A+', 'A'],
             'Good': ['B+', 'B'],
             'Average': ['C+', 'C'],
             'Below Average': ['D'],
-            'Fail': ['F', 'RA']
+            'Fail': ['F', 'RA', 'Ab']
         }
+    
+    def _grade_lookup(self, values: np.ndarray, table: Dict[str, Any]) -> Dict[Any, Any]:
+        """
+        Map each distinct raw grade cell (e.g. 'a+', ' O', 'AB') to its entry in
+        table, keyed by canonical grade; grades not in the table are left out
+        """
+        canonical = {grade.upper(): grade for grade in self.grade_points}
+        lookup = {}
+        for value in values:
+            grade = canonical.get(str(value).strip().upper())
+            if grade in table:
+                lookup[value] = table[grade]
+        return lookup
         
-    def analyze_file(self, file_path: str) -> Dict[str, Any]:
+    def analyze_file(self, file_path: str, group_by: Optional[List[List[str]]] = None) -> Dict[str, Any]:
         """
         Perform comprehensive analysis on uploaded data file
         
         Args:
             file_path: Path to the uploaded Excel/CSV file
+            group_by: Breakdowns for the group comparison, e.g.
+                [['Branch'], ['Branch', 'Section']]; defaults to branch,
+                section and program
             
         Returns:
             Dictionary containing all analysis results
@@ -52,32 +157,13 @@ class DataAnalyzer:
             
             # Load data
             df = self._load_data(file_path)
-            df.replace(['--', 'NA', 'null', ''], np.nan, inplace=True)
-
             if df is None or df.empty:
                 raise ValueError("Unable to load data from file or file is empty")
-
-
+            df.replace(['--', 'NA', 'null', ''], np.nan, inplace=True)
             
             # Perform comprehensive analysis
-            analysis_results = {
-                'file_info': self._get_file_info(file_path, df),
-                'summary_statistics': self._calculate_summary_statistics(df),
-                'grade_distribution': self._analyze_grade_distribution(df),
-                'performance_trends': self._analyze_performance_trends(df),
-                'branch_comparison': self._analyze_branch_performance(df),
-                'subject_performance': self._analyze_subject_performance(df),
-                'student_rankings': self._calculate_student_rankings(df),
-                'statistical_insights': self._generate_statistical_insights(df),
-                'detailed_stats': self._generate_detailed_statistics(df),
-                'recommendations': self._generate_recommendations(df),
-                'charts': self._prepare_chart_data(df)
-            }
-            logger.info("Loading file info...")
-            analysis_results['file_info'] = self._get_file_info(file_path, df)
-
-            logger.info("Calculating summary statistics...")
-            analysis_results['summary_statistics'] = self._calculate_summary_statistics(df)
+            analysis_results = self.analyze_dataframe(df, file_path, group_by)
+            
             # Add metadata
             analysis_results['analysis_timestamp'] = datetime.now().isoformat()
             analysis_results['total_students'] = len(df)
@@ -89,6 +175,20 @@ class DataAnalyzer:
             logger.error(f"Error during analysis: {str(e)}")
             raise Exception(f"Analysis failed: {str(e)}")
     
+    def analyze_dataframe(self, df: pd.DataFrame, file_path: str = '',
+                          group_by: Optional[List[List[str]]] = None) -> Dict[str, Any]:
+        """Run every section over a loaded, cleaned DataFrame, computing each exactly once"""
+        ctx = AnalysisContext(df, file_path, group_by)
+        return {name: self._section(ctx, name) for name in self.SECTIONS}
+    
+    def _section(self, ctx: AnalysisContext, name: str) -> Any:
+        """A section's result, computed on first request"""
+        if name not in ctx.sections:
+            start = time.perf_counter()
+            ctx.sections[name] = getattr(self, self.SECTIONS[name])(ctx)
+            logger.debug(f"Section {name} took {time.perf_counter() - start:.3f}s")
+        return ctx.sections[name]
+    
     def _load_data(self, file_path: str) -> Optional[pd.DataFrame]:
         """Load data from Excel or CSV file"""
         try:
@@ -97,11 +197,7 @@ class DataAnalyzer:
             if file_extension == '.csv':
                 df = pd.read_csv(file_path)
             elif file_extension in ['.xlsx', '.xls']:
-                # Try to read with multi-index if it exists
-                try:
-                    df = pd.read_excel(file_path, header=[0, 1])
-                except:
-                    df = pd.read_excel(file_path)
+                df = load_workbook(file_path)
             else:
                 raise ValueError(f"Unsupported file format: {file_extension}")
             
@@ -118,7 +214,9 @@ class DataAnalyzer:
             # Handle multi-index columns
             if isinstance(df.columns, pd.MultiIndex):
                 # Flatten multi-index columns
-                df.columns = [f"{col[0]}_{col[1]}" if col[1] else col[0] for col in df.columns]
+                # Fields without a second header row (e.g. Branch) come back as 'Unnamed: 4_level_1'
+                df.columns = [f"{col[0]}_{col[1]}" if col[1] and not str(col[1]).startswith('Unnamed:') else col[0]
+                              for col in df.columns]
             
             # Remove empty rows and columns
             df = df.dropna(how='all').dropna(axis=1, how='all')
@@ -127,9 +225,9 @@ class DataAnalyzer:
             df.columns = df.columns.astype(str)
             df.columns = [col.strip().replace('\n', ' ').replace('\r', '') for col in df.columns]
             
-            # Convert CGPA column to numeric if it exists
-            cgpa_cols = [col for col in df.columns if 'cgpa' in col.lower() or 'gpa' in col.lower()]
-            for col in cgpa_cols:
+            # Convert CGPA/SGPA and backlog columns to numeric
+            schema = infer_schema(tuple(df.columns))
+            for col in schema.gpa_cols + ([schema.backlogs] if schema.backlogs else []):
                 df[col] = pd.to_numeric(df[col], errors='coerce')
             
             return df
@@ -138,8 +236,9 @@ class DataAnalyzer:
             logger.error(f"Error cleaning data: {str(e)}")
             return df
     
-    def _get_file_info(self, file_path: str, df: pd.DataFrame) -> Dict[str, Any]:
+    def _get_file_info(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """Get basic file information"""
+        file_path, df = ctx.file_path, ctx.df
         file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
         
         return {
@@ -151,8 +250,9 @@ class DataAnalyzer:
             'upload_time': datetime.now().isoformat()
         }
     
-    def _calculate_summary_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_summary_statistics(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """Calculate comprehensive summary statistics"""
+        df = ctx.df
         try:
             summary = {
                 'total_students': len(df),
@@ -160,10 +260,8 @@ class DataAnalyzer:
                 'data_completeness': (1 - df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
             }
             
-            # Find CGPA columns
-            cgpa_cols = [col for col in df.columns if 'cgpa' in col.lower()]
-            if cgpa_cols:
-                cgpa_data = df[cgpa_cols[0]].dropna()
+            cgpa_data = ctx.cgpa
+            if ctx.cgpa_col:
                 if len(cgpa_data) > 0:
                     summary.update({
                         'average_cgpa': round(cgpa_data.mean(), 2),
@@ -181,9 +279,8 @@ class DataAnalyzer:
             #     # summary['branches'] = branches.tolist()
             
             # Calculate pass rate 
-            if cgpa_cols:
+            if ctx.cgpa_col:
                 total_count = len(cgpa_data)
-                cgpa_data = df[cgpa_cols[0]].dropna()
                 if len(cgpa_data) > 0:
                     summary['pass_percentage'] = round(( len(cgpa_data) /total_count) * 100, 1)
             
@@ -193,20 +290,21 @@ class DataAnalyzer:
             logger.error(f"Error calculating summary statistics: {str(e)}")
             return {'total_students': len(df), 'error': str(e)}
     
-    def _analyze_grade_distribution(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_grade_distribution(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """Analyze grade distribution across all subjects"""
+        df = ctx.df
         try:
-            grade_data = {}
             grade_counts = {grade: 0 for grade in self.grade_points.keys()}
             
-            # Find grade columns
-            grade_cols = [col for col in df.columns if 'grade' in col.lower() and col.lower() != 'grade']
-            
-            for col in grade_cols:
-                grades = df[col].dropna().astype(str).str.upper()
-                for grade in grades:
-                    if grade in grade_counts:
-                        grade_counts[grade] += 1
+            if ctx.grade_cols:
+                # Count every cell of every grade column in one pass, then fold
+                # spelling variants of the same grade together
+                codes, values = pd.factorize(df[ctx.grade_cols].to_numpy().ravel())
+                value_counts = np.bincount(codes[codes >= 0], minlength=len(values))
+                lookup = self._grade_lookup(values, {grade: grade for grade in grade_counts})
+                for value, count in zip(values, value_counts):
+                    if value in lookup:
+                        grade_counts[lookup[value]] += int(count)
             
             # Calculate percentages
             total_grades = sum(grade_counts.values())
@@ -220,7 +318,7 @@ class DataAnalyzer:
             # Category-wise analysis
             category_counts = {}
             for category, grades in self.grade_categories.items():
-                category_counts[category] = sum(grade_counts[grade] for grade in grades)
+                category_counts[category] = sum(grade_counts.get(grade, 0) for grade in grades)
             
             return {
                 'grades': list(grade_counts.keys()),
@@ -234,24 +332,13 @@ class DataAnalyzer:
             logger.error(f"Error analyzing grade distribution: {str(e)}")
             return {'error': str(e)}
     
-    def _analyze_performance_trends(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_performance_trends(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """Analyze performance trends across semesters"""
+        df = ctx.df
         try:
             trends = {}
             
-            # Find semester-wise CGPA/SGPA columns
-            sem_cols = {}
-            for col in df.columns:
-                col_lower = col.lower()
-                if 'sem' in col_lower and ('gpa' in col_lower or 'cgpa' in col_lower):
-                    if 'sem1' in col_lower or 'semester 1' in col_lower:
-                        sem_cols['Semester 1'] = col
-                    elif 'sem2' in col_lower or 'semester 2' in col_lower:
-                        sem_cols['Semester 2'] = col
-                    elif 'sem3' in col_lower or 'semester 3' in col_lower:
-                        sem_cols['Semester 3'] = col
-                    elif 'sem4' in col_lower or 'semester 4' in col_lower:
-                        sem_cols['Semester 4'] = col
+            sem_cols = {f"Semester {number}": col for number, col in ctx.schema.sgpa.items()}
             
             if sem_cols:
                 semesters = []
@@ -278,45 +365,19 @@ class DataAnalyzer:
             logger.error(f"Error analyzing performance trends: {str(e)}")
             return {'error': str(e)}
     
-    def _analyze_branch_performance(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_branch_performance(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """Analyze performance comparison across branches"""
         try:
             branch_analysis = {}
             
-            # Find branch and CGPA columns
-            branch_cols = [col for col in df.columns if 'branch' in col.lower()]
-            cgpa_cols = [col for col in df.columns if 'cgpa' in col.lower()]
-            
-            if branch_cols and cgpa_cols:
-                branch_col = branch_cols[0]
-                cgpa_col = cgpa_cols[0]
-                
-                # Group by branch and calculate statistics
-                branch_stats = df.groupby(branch_col)[cgpa_col].agg([
-                    'count', 'mean', 'median', 'std', 'min', 'max'
-                ]).round(2)
-                
-                branches = branch_stats.index.tolist()
-                avg_cgpa = branch_stats['mean'].tolist()
-                student_counts = branch_stats['count'].tolist()
-                
-                # Calculate pass rates by branch
-                pass_rates = []
-                for branch in branches:
-                    branch_data = df[df[branch_col] == branch][cgpa_col]
-                    branch_data = pd.to_numeric(branch_data, errors='coerce').dropna()
-                    if len(branch_data) > 0:
-                        pass_count = len(branch_data[branch_data >= 5.0])
-                        pass_rates.append(round((pass_count / len(branch_data)) * 100, 1))
-                    else:
-                        pass_rates.append(0)
-                
+            if ctx.branch_col and ctx.cgpa_col:
+                stats = self._group_statistics(ctx, [ctx.branch_col])
                 branch_analysis = {
-                    'branches': branches,
-                    'avg_cgpa': avg_cgpa,
-                    'student_counts': student_counts,
-                    'pass_rates': pass_rates,
-                    'detailed_stats': branch_stats.to_dict('index')
+                    'branches': stats['groups'],
+                    'avg_cgpa': stats['avg_cgpa'],
+                    'student_counts': stats['student_counts'],
+                    'pass_rates': stats['pass_rates'],
+                    'detailed_stats': stats['detailed_stats']
                 }
             
             return branch_analysis
@@ -325,31 +386,93 @@ class DataAnalyzer:
             logger.error(f"Error analyzing branch performance: {str(e)}")
             return {'error': str(e)}
     
-    def _analyze_subject_performance(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_group_performance(self, ctx: AnalysisContext) -> Dict[str, Any]:
+        """CGPA, pass rate and backlog breakdowns for each requested grouping"""
+        try:
+            comparisons = []
+            if not ctx.cgpa_col:
+                return {'comparisons': comparisons}
+            
+            for fields in ctx.group_by:
+                columns = [ctx.column_for(field) for field in fields]
+                missing = [field for field, col in zip(fields, columns) if col is None]
+                if missing:
+                    logger.info(f"Skipping breakdown by {' / '.join(fields)}: no {', '.join(missing)} column")
+                    continue
+                comparisons.append({'fields': list(fields), **self._group_statistics(ctx, columns)})
+            
+            return {'comparisons': comparisons}
+            
+        except Exception as e:
+            logger.error(f"Error analyzing group performance: {str(e)}")
+            return {'error': str(e)}
+    
+    def _group_statistics(self, ctx: AnalysisContext, columns: List[str]) -> Dict[str, Any]:
+        """
+        Per-group CGPA statistics, pass rate and backlog distribution from a
+        single grouped aggregation over the given key columns
+        """
+        df = ctx.df
+        cgpa = pd.to_numeric(df[ctx.cgpa_col], errors='coerce')
+        frame = pd.DataFrame({'cgpa': cgpa, 'passed': cgpa >= PASS_CGPA})
+        if ctx.backlog_col:
+            backlogs = pd.to_numeric(df[ctx.backlog_col], errors='coerce').clip(upper=3)
+            frame['backlogs'] = backlogs.map({0: '0', 1: '1', 2: '2', 3: '3+'})
+        
+        grouped = frame.groupby([df[col] for col in columns])
+        stats = grouped.agg(
+            count=('cgpa', 'count'), mean=('cgpa', 'mean'), median=('cgpa', 'median'),
+            std=('cgpa', 'std'), min=('cgpa', 'min'), max=('cgpa', 'max'), passed=('passed', 'sum')
+        )
+        stats['pass_rate'] = (stats['passed'] / stats['count'] * 100).fillna(0).round(1)
+        # Single-student groups have no std; report it as null rather than NaN, which isn't valid JSON
+        stats = stats.drop(columns='passed').round(2).astype(object)
+        stats = stats.where(stats.notna(), None)
+        if ctx.backlog_col:
+            backlog_counts = grouped['backlogs'].value_counts().unstack(fill_value=0)
+        
+        labels = [' / '.join(map(str, key)) if isinstance(key, tuple) else key for key in stats.index]
+        detailed_stats = {}
+        for label, key, row in zip(labels, stats.index, stats.to_dict('records')):
+            if ctx.backlog_col:
+                row['backlogs'] = ({str(n): int(c) for n, c in backlog_counts.loc[key].items()}
+                                   if key in backlog_counts.index else {})
+            detailed_stats[label] = row
+        
+        return {
+            'groups': labels,
+            'avg_cgpa': stats['mean'].tolist(),
+            'student_counts': stats['count'].tolist(),
+            'pass_rates': stats['pass_rate'].tolist(),
+            'detailed_stats': detailed_stats
+        }
+    
+    def _analyze_subject_performance(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """Analyze performance in individual subjects"""
+        df = ctx.df
         try:
             subject_analysis = {}
+            graded = [(course, details['grade']) for course, details in ctx.schema.courses.items()
+                      if 'grade' in details][:10]  # Limit to first 10 subjects
             
-            # Find subject/course columns with grades
-            subject_cols = [col for col in df.columns if 'grade' in col.lower() and '_grade' in col.lower()]
-            
-            if subject_cols:
+            if graded:
                 subjects = []
                 avg_grade_points = []
                 pass_rates = []
                 
-                for col in subject_cols[:10]:  # Limit to first 10 subjects
-                    subject_name = col.replace('_Grade', '').replace('_grade', '')
-                    subjects.append(subject_name)
-                    
-                    # Convert grades to grade points
-                    grades = df[col].dropna().astype(str).str.upper()
-                    grade_points = [self.grade_points.get(grade, 0) for grade in grades]
-                    
-                    if grade_points:
-                        avg_grade_points.append(round(np.mean(grade_points), 2))
-                        pass_count = len([gp for gp in grade_points if gp >= 4])
-                        pass_rates.append(round((pass_count / len(grade_points)) * 100, 1))
+                subject_cols = [col for _, col in graded]
+                # Grade points of every graded cell; unrecognised grades count as 0
+                grades = df[subject_cols]
+                lookup = self._grade_lookup(pd.unique(grades.to_numpy().ravel()), self.grade_points)
+                points = grades.apply(lambda col: col.map(lookup).fillna(0).where(col.notna()))
+                means = points.mean()
+                pass_share = (points >= 4).sum() / points.count()
+                
+                for course, col in graded:
+                    subjects.append(course)
+                    if points[col].count():
+                        avg_grade_points.append(round(float(means[col]), 2))
+                        pass_rates.append(round(float(pass_share[col]) * 100, 1))
                     else:
                         avg_grade_points.append(0)
                         pass_rates.append(0)
@@ -366,24 +489,20 @@ class DataAnalyzer:
             logger.error(f"Error analyzing subject performance: {str(e)}")
             return {'error': str(e)}
     
-    def _calculate_student_rankings(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_student_rankings(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """Calculate student rankings based on CGPA"""
+        df = ctx.df
         try:
             rankings = {}
             
-            # Find relevant columns
-            name_cols = [col for col in df.columns if 'name' in col.lower()]
-            cgpa_cols = [col for col in df.columns if 'cgpa' in col.lower()]
-            branch_cols = [col for col in df.columns if 'branch' in col.lower()]
-            
-            if name_cols and cgpa_cols:
-                name_col = name_cols[0]
-                cgpa_col = cgpa_cols[0]
+            if ctx.name_col and ctx.cgpa_col:
+                name_col = ctx.name_col
+                cgpa_col = ctx.cgpa_col
                 
                 # Create ranking dataframe
                 ranking_df = df[[name_col, cgpa_col]].copy()
-                if branch_cols:
-                    ranking_df['Branch'] = df[branch_cols[0]]
+                if ctx.branch_col:
+                    ranking_df['Branch'] = df[ctx.branch_col]
                 
                 # Convert CGPA to numeric and sort
                 ranking_df[cgpa_col] = pd.to_numeric(ranking_df[cgpa_col], errors='coerce')
@@ -406,15 +525,13 @@ class DataAnalyzer:
             logger.error(f"Error calculating rankings: {str(e)}")
             return {'error': str(e)}
     
-    def _generate_statistical_insights(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _generate_statistical_insights(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """Generate advanced statistical insights"""
         try:
             insights = {}
             
-            # Find CGPA column
-            cgpa_cols = [col for col in df.columns if 'cgpa' in col.lower()]
-            if cgpa_cols:
-                cgpa_data = pd.to_numeric(df[cgpa_cols[0]], errors='coerce').dropna()
+            if ctx.cgpa_col:
+                cgpa_data = ctx.cgpa
                 
                 if len(cgpa_data) > 1:
                     # Distribution analysis
@@ -498,16 +615,14 @@ class DataAnalyzer:
         except Exception as e:
             return {'error': str(e)}
     
-    def _generate_detailed_statistics(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _generate_detailed_statistics(self, ctx: AnalysisContext) -> List[Dict[str, Any]]:
         """Generate detailed statistics table"""
+        df = ctx.df
         try:
             stats_table = []
             
-            # Numeric columns analysis
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            
-            for col in numeric_cols:
-                if 'cgpa' in col.lower() or 'gpa' in col.lower():
+            for col in ctx.schema.gpa_cols:
+                if pd.api.types.is_numeric_dtype(df[col]):
                     data = df[col].dropna()
                     if len(data) > 0:
                         stats_table.append({
@@ -526,15 +641,13 @@ class DataAnalyzer:
             logger.error(f"Error generating detailed statistics: {str(e)}")
             return []
     
-    def _generate_recommendations(self, df: pd.DataFrame) -> List[str]:
+    def _generate_recommendations(self, ctx: AnalysisContext) -> List[str]:
         """Generate actionable recommendations based on analysis"""
         try:
             recommendations = []
             
-            # Find CGPA column
-            cgpa_cols = [col for col in df.columns if 'cgpa' in col.lower()]
-            if cgpa_cols:
-                cgpa_data = pd.to_numeric(df[cgpa_cols[0]], errors='coerce').dropna()
+            if ctx.cgpa_col:
+                cgpa_data = ctx.cgpa
                 
                 if len(cgpa_data) > 0:
                     avg_cgpa = cgpa_data.mean()
@@ -555,7 +668,7 @@ class DataAnalyzer:
                         recommendations.append(f"Pass rate is {pass_rate:.1f}%. Consider additional tutorial sessions for struggling students.")
                     
                     # Grade distribution recommendations
-                    grade_dist = self._analyze_grade_distribution(df)
+                    grade_dist = self._section(ctx, 'grade_distribution')
                     if 'category_distribution' in grade_dist:
                         fail_count = grade_dist['category_distribution'].get('Fail', 0)
                         total_grades = grade_dist.get('total_grades_analyzed', 1)
@@ -565,7 +678,7 @@ class DataAnalyzer:
                             recommendations.append("High failure rate detected in individual subjects. Review curriculum difficulty and teaching methods.")
             
             # Branch-wise recommendations
-            branch_analysis = self._analyze_branch_performance(df)
+            branch_analysis = self._section(ctx, 'branch_comparison')
             if 'branches' in branch_analysis and len(branch_analysis['branches']) > 1:
                 recommendations.append("Performance varies across branches. Consider sharing best practices from high-performing branches.")
             
@@ -578,13 +691,13 @@ class DataAnalyzer:
             logger.error(f"Error generating recommendations: {str(e)}")
             return ["Unable to generate recommendations due to data analysis error."]
     
-    def _prepare_chart_data(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _prepare_chart_data(self, ctx: AnalysisContext) -> Dict[str, Any]:
         """Prepare data for charts and visualizations"""
         try:
             chart_data = {}
             
             # Grade distribution chart data
-            grade_dist = self._analyze_grade_distribution(df)
+            grade_dist = self._section(ctx, 'grade_distribution')
             if 'grades' in grade_dist and 'counts' in grade_dist:
                 chart_data['grade_distribution'] = {
                     'labels': grade_dist['grades'],
@@ -592,12 +705,12 @@ class DataAnalyzer:
                 }
             
             # Performance trends chart data
-            perf_trends = self._analyze_performance_trends(df)
+            perf_trends = self._section(ctx, 'performance_trends')
             if 'semesters' in perf_trends:
                 chart_data['performance_trends'] = perf_trends
             
             # Branch comparison chart data
-            branch_analysis = self._analyze_branch_performance(df)
+            branch_analysis = self._section(ctx, 'branch_comparison')
             if 'branches' in branch_analysis:
                 chart_data['branch_comparison'] = {
                     'labels': branch_analysis['branches'],
@@ -0,0 +1,145 @@
+"""
+Process-wide pool of warm Chrome drivers shared across scrape jobs,
+with health checks and recycling after a fixed number of pages
+"""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPool:
+    """Size-bounded pool of reusable WebDriver instances"""
+
+    def __init__(self, factory: Callable, max_size: int = 3, max_pages: int = 50,
+                 acquire_timeout: float = 300):
+        """
+        Args:
+            factory: Callable returning a new, ready-to-use driver
+            max_size: Maximum number of live drivers (idle + borrowed)
+            max_pages: Pages a driver may serve before it is recycled
+            acquire_timeout: Seconds to wait for a free driver before failing
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._pages: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _is_healthy(self, driver) -> bool:
+        """Check that the browser session still responds"""
+        try:
+            driver.current_url
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy driver: {e}")
+            return False
+
+    def _quit(self, driver):
+        """Quit a driver and forget its page counter"""
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error(f"Error closing driver: {e}")
+
+    def _new_driver(self):
+        driver = self.factory()
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow a driver, reusing an idle one when it is still healthy"""
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+
+        if not self._slots.acquire(timeout=timeout if timeout is not None else self.acquire_timeout):
+            raise TimeoutError("Timed out waiting for a free Chrome driver")
+
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._new_driver()
+                if self._is_healthy(driver):
+                    return driver
+                self._quit(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, discard: bool = False):
+        """Return a borrowed driver; recycle it if worn out or broken"""
+        try:
+            with self._lock:
+                pages = self._pages.get(id(driver), 0)
+
+            if discard or self._closed or pages >= self.max_pages:
+                if pages >= self.max_pages:
+                    logger.info(f"Recycling driver after {pages} pages")
+                self._quit(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def record_page(self, driver):
+        """Count one page served by a borrowed driver"""
+        with self._lock:
+            if id(driver) in self._pages:
+                self._pages[id(driver)] += 1
+
+    @contextmanager
+    def borrow(self, timeout: Optional[float] = None):
+        """Context manager that acquires a driver and always returns it"""
+        driver = self.acquire(timeout)
+        discard = False
+        try:
+            yield driver
+        except Exception:
+            discard = not self._is_healthy(driver)
+            raise
+        finally:
+            self.release(driver, discard=discard)
+
+    def warm_up(self, count: Optional[int] = None):
+        """Pre-start drivers so the first job does not pay browser startup"""
+        count = self.max_size if count is None else min(count, self.max_size)
+        started = []
+        try:
+            for _ in range(count):
+                started.append(self.acquire(timeout=0))
+        except Exception as e:
+            logger.warning(f"Driver pool warm-up stopped early: {e}")
+        finally:
+            for driver in started:
+                self.release(driver)
+        logger.info(f"Driver pool warmed up with {len(started)} driver(s)")
+
+    def stats(self) -> Dict[str, int]:
+        """Current pool occupancy"""
+        with self._lock:
+            live = len(self._pages)
+        return {'live': live, 'idle': self._idle.qsize(), 'max_size': self.max_size}
+
+    def close(self):
+        """Quit all idle drivers; borrowed ones are quit on release"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
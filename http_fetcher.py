@@ -0,0 +1,161 @@
+"""
+Direct HTTP/JSON fetcher for student results that talks to the portal's
+results API over a pooled requests session instead of driving a browser
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://api.campx.in/exams/results/student-results"
+
+# Field aliases seen in results payloads, mapped to the column names used
+# by the Selenium extractor so both engines produce identical records
+STUDENT_FIELDS = {
+    'hall_ticket_number': ['rollNo', 'hallTicketNumber', 'hallTicketNo', 'studentRollNo'],
+    'student_name': ['studentName', 'fullName', 'name'],
+    'program': ['programName', 'program', 'courseName'],
+    'cgpa': ['cgpa', 'CGPA', 'overallCgpa'],
+}
+SEMESTER_LIST_FIELDS = ['semesters', 'semesterResults', 'results']
+COURSE_LIST_FIELDS = ['courses', 'subjects', 'courseResults']
+SGPA_FIELDS = ['sgpa', 'SGPA', 'semesterGpa']
+COURSE_FIELDS = {
+    'Course Code': ['courseCode', 'subjectCode', 'code'],
+    'Course Name': ['courseName', 'subjectName', 'name'],
+    'Credits': ['credits', 'credit'],
+    'Grade': ['grade', 'gradeLetter'],
+    'Status': ['status', 'result', 'resultStatus'],
+}
+# Fields the portal puts its error message in, and the phrases that mean it
+# has no result for the roll number (the same wording its results page shows).
+# They name the result or roll number, so auth, session and routing errors
+# such as "Invalid token" or "404 Not Found" stay ordinary failures.
+MESSAGE_FIELDS = ['message', 'error', 'detail', 'msg']
+NO_RESULT_PHRASES = (
+    'result not found', 'results not found', 'no result', 'no record found', 'no records found',
+    'student not found', 'invalid hall ticket', 'invalid roll number',
+    'hall ticket number does not exist', 'roll number does not exist',
+)
+
+
+class ResultNotFound(Exception):
+    """Raised when the portal explicitly reports that it has no result for a roll number"""
+
+
+def _first(data: Dict[str, Any], keys: List[str], default: Any = None) -> Any:
+    """Return the first present, non-empty value among alias keys"""
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, ''):
+            return value
+    return default
+
+
+def reports_no_result(payload: Any) -> bool:
+    """Whether a response body is the portal's explicit "no result" message"""
+    if not isinstance(payload, dict):
+        return False
+    message = _first(payload, MESSAGE_FIELDS, '')
+    if isinstance(message, dict):
+        message = _first(message, MESSAGE_FIELDS, '')
+    return any(phrase in str(message).lower() for phrase in NO_RESULT_PHRASES)
+
+
+class HttpResultFetcher:
+    """Fetch and normalize student results over plain HTTP"""
+
+    def __init__(self, api_url: Optional[str] = None, timeout: float = 10, pool_size: int = 10,
+                 session: Optional[requests.Session] = None):
+        self.api_url = api_url or os.environ.get('RESULTS_API_URL', DEFAULT_API_URL)
+        self.timeout = timeout
+        self.session = session or self._create_session(pool_size)
+
+    def _create_session(self, pool_size: int) -> requests.Session:
+        """Build a keep-alive session with retries on transient server errors"""
+        session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                      allowed_methods=['GET'])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'Accept': 'application/json',
+            'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        })
+        return session
+
+    def fetch_raw(self, roll_number: str) -> Dict[str, Any]:
+        """
+        Fetch one student's result and normalize it
+
+        Returns:
+            Dictionary with hall_ticket_number, student_name, program, cgpa,
+            semesters (list of course-row lists) and sgpa (list of strings)
+
+        Raises:
+            ResultNotFound: The portal says it has no result for this roll number
+            requests.RequestException / ValueError: Transport or payload errors,
+                including a bare 404, which callers should treat as a failed fetch
+        """
+        response = self.session.get(
+            self.api_url,
+            params={'rollNo': roll_number, 'examType': 'general'},
+            timeout=self.timeout
+        )
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        if reports_no_result(payload):
+            raise ResultNotFound(roll_number)
+        response.raise_for_status()
+        if payload is None:
+            raise ValueError(f"Results response for {roll_number} is not JSON")
+
+        return self.parse_payload(payload, roll_number)
+
+    def parse_payload(self, payload: Any, roll_number: str) -> Dict[str, Any]:
+        """
+        Normalize a results payload into engine-independent fields
+
+        Only an explicit "no result" message raises ResultNotFound; empty or
+        unrecognized payloads raise ValueError, as the API may have changed
+        under us and the roll number should still go to the browser.
+        """
+        if reports_no_result(payload):
+            raise ResultNotFound(roll_number)
+        if isinstance(payload, dict) and isinstance(payload.get('data'), (dict, list)):
+            payload = payload['data']
+        if isinstance(payload, list):
+            payload = payload[0] if payload else None
+        if not isinstance(payload, dict) or not payload:
+            raise ValueError(f"Unexpected results payload for {roll_number}: {type(payload).__name__}")
+
+        student = payload.get('student') if isinstance(payload.get('student'), dict) else payload
+        raw = {
+            field: str(_first(student, keys, _first(payload, keys, ''))).strip()
+            for field, keys in STUDENT_FIELDS.items()
+        }
+        if not raw['hall_ticket_number'] and not raw['student_name']:
+            raise ValueError(f"Results payload for {roll_number} has no student fields")
+
+        semesters = []
+        sgpa = []
+        for semester in _first(payload, SEMESTER_LIST_FIELDS, []) or []:
+            courses = _first(semester, COURSE_LIST_FIELDS, []) or []
+            semesters.append([
+                {column: str(_first(course, keys, '')).strip() for column, keys in COURSE_FIELDS.items()}
+                for course in courses
+            ])
+            sgpa.append(str(_first(semester, SGPA_FIELDS, 'N/A')))
+
+        raw['semesters'] = semesters
+        raw['sgpa'] = sgpa
+        return raw
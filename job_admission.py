@@ -0,0 +1,216 @@
+"""
+Admission control for background jobs: a bounded number run at once within
+a shared budget (e.g. Chrome instances), waiting jobs are ordered by priority
+then arrival and told their place and estimated start, and past a backlog
+limit new jobs are turned away instead of piling up
+"""
+
+import bisect
+import heapq
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds per unit of work assumed for a kind of job before any has finished
+DEFAULT_RATE = 5.0
+
+
+class AdmissionRejected(Exception):
+    """The backlog is full; the job should not be started"""
+
+
+@dataclass(order=True)
+class Ticket:
+    """A job's place with the scheduler; sorts by priority, then arrival"""
+    priority: int
+    seq: int
+    job_id: str = field(compare=False)
+    cost: int = field(default=0, compare=False)
+    work: float = field(default=1.0, compare=False)
+    work_kind: str = field(default='', compare=False)
+    on_position: Optional[Callable[[int], None]] = field(default=None, compare=False)
+    started: Optional[float] = field(default=None, compare=False)
+
+
+class JobScheduler:
+    """Priority queue in front of a kind of background job, with a shared resource budget"""
+
+    def __init__(self, name: str, max_active: int = 2, max_waiting: int = 50, budget: Optional[int] = None):
+        """
+        Args:
+            name: Label for logs and stats
+            max_active: Jobs allowed to run at once
+            max_waiting: Jobs allowed to wait before new ones are rejected
+            budget: Units of a shared resource running jobs may hold together,
+                None for no limit
+        """
+        self.name = name
+        self.max_active = max(1, max_active)
+        self.max_waiting = max_waiting
+        self.budget = budget
+        self._active: Dict[str, Ticket] = {}
+        self._waiting: List[Ticket] = []
+        self._tickets: Dict[str, Ticket] = {}
+        self._rates: Dict[str, float] = {}
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def enqueue(self, job_id: str, on_position: Optional[Callable[[int], None]] = None, force: bool = False,
+                priority: int = 0, cost: int = 0, work: float = 1.0, work_kind: str = ''):
+        """
+        Reserve a place for a job, called before its thread is started
+
+        Args:
+            on_position: Called with the job's 1-based place in the queue
+                whenever it changes, and with 0 once the job may run
+            force: Queue even when the backlog is full, for jobs accepted earlier
+            priority: Lower runs first; equal priorities run in arrival order
+            cost: Budget units the job holds while running, capped at the budget
+            work: Size of the job (e.g. roll numbers), for start time estimates
+            work_kind: Jobs of the same kind share a learned seconds-per-unit rate
+
+        Raises:
+            AdmissionRejected: The queue is already full
+        """
+        with self._cond:
+            if not force and len(self._waiting) >= self.max_waiting:
+                raise AdmissionRejected(f"{len(self._waiting)} {self.name} jobs are already waiting")
+            if self.budget is not None:
+                cost = min(cost, self.budget)
+            self._seq += 1
+            ticket = Ticket(priority, self._seq, job_id, cost, max(work, 1.0), work_kind, on_position)
+            index = bisect.bisect(self._waiting, ticket)
+            self._waiting.insert(index, ticket)
+            self._tickets[job_id] = ticket
+            # Jobs behind a higher-priority arrival moved back a place
+            self._notify_positions(index)
+
+    def cancel(self, job_id: str):
+        """Give up the place of an enqueued job that will never run"""
+        with self._cond:
+            ticket = self._tickets.pop(job_id, None)
+            if ticket in self._waiting:
+                index = self._waiting.index(ticket)
+                del self._waiting[index]
+                self._notify_positions(index)
+                self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, job_id: str, on_wait: Optional[Callable[[], None]] = None,
+             wait_interval: float = 30) -> Iterator[int]:
+        """
+        Wait until an enqueued job is first in line and fits, then hold its place while it runs
+
+        Jobs start strictly in queue order: a job that doesn't fit the budget
+        yet holds back those behind it, so large jobs are never starved.
+
+        Args:
+            on_wait: Called every wait_interval seconds while waiting, e.g. to heartbeat
+
+        Yields:
+            The budget units granted to the job
+        """
+        with self._cond:
+            ticket = self._tickets.get(job_id)
+            if ticket is None:
+                self.enqueue(job_id, force=True)
+                ticket = self._tickets[job_id]
+            # Admits and cancels wake every waiter, so beat on a deadline rather than on wait timeouts
+            last_beat = time.monotonic()
+            while not (self._waiting[0] is ticket and self._fits(ticket)):
+                self._cond.wait(timeout=max(0.0, last_beat + wait_interval - time.monotonic()))
+                if on_wait and time.monotonic() - last_beat >= wait_interval:
+                    last_beat = time.monotonic()
+                    on_wait()
+            self._waiting.pop(0)
+            ticket.started = time.time()
+            self._active[job_id] = ticket
+            logger.debug(f"Admitted {self.name} job {job_id} holding {ticket.cost} of {self.budget}")
+            if ticket.on_position:
+                ticket.on_position(0)
+            self._notify_positions(0)
+            self._cond.notify_all()
+        try:
+            yield ticket.cost
+        finally:
+            with self._cond:
+                del self._active[job_id]
+                self._tickets.pop(job_id, None)
+                self._learn_rate(ticket, time.time() - ticket.started)
+                self._cond.notify_all()
+
+    def _fits(self, ticket: Ticket) -> bool:
+        if len(self._active) >= self.max_active:
+            return False
+        return self.budget is None or self._budget_used() + ticket.cost <= self.budget
+
+    def _budget_used(self) -> int:
+        return sum(ticket.cost for ticket in self._active.values())
+
+    def _learn_rate(self, ticket: Ticket, elapsed: float):
+        """Moving average of seconds per unit of work, per kind of job"""
+        rate = elapsed / ticket.work
+        previous = self._rates.get(ticket.work_kind)
+        self._rates[ticket.work_kind] = rate if previous is None else 0.7 * previous + 0.3 * rate
+
+    def _duration(self, ticket: Ticket) -> float:
+        return ticket.work * self._rates.get(ticket.work_kind, DEFAULT_RATE)
+
+    def _notify_positions(self, start: int):
+        """Tell waiting jobs from index start on their current place"""
+        for index in range(start, len(self._waiting)):
+            ticket = self._waiting[index]
+            if ticket.on_position:
+                ticket.on_position(index + 1)
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based place of a waiting job, 0 for a running one, None if unknown"""
+        with self._cond:
+            if job_id in self._active:
+                return 0
+            ticket = self._tickets.get(job_id)
+            return self._waiting.index(ticket) + 1 if ticket in self._waiting else None
+
+    def estimated_start(self, job_id: str) -> Optional[float]:
+        """
+        Seconds until a waiting job is expected to start, None if it isn't waiting
+
+        Replays the queue against the running jobs' expected finish times,
+        using each kind of job's learned rate, slot limit and budget.
+        """
+        with self._cond:
+            ticket = self._tickets.get(job_id)
+            if ticket is None or ticket not in self._waiting:
+                return None
+
+            now = time.time()
+            running = [(max(now, t.started + self._duration(t)), t.cost) for t in self._active.values()]
+            heapq.heapify(running)
+            clock, used = now, sum(cost for _, cost in running)
+            for waiting in self._waiting:
+                while len(running) >= self.max_active or (
+                        self.budget is not None and used + waiting.cost > self.budget):
+                    finish, cost = heapq.heappop(running)
+                    clock, used = max(clock, finish), used - cost
+                if waiting is ticket:
+                    return round(clock - now)
+                heapq.heappush(running, (clock + self._duration(waiting), waiting.cost))
+                used += waiting.cost
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'active': len(self._active),
+                'waiting': len(self._waiting),
+                'max_active': self.max_active,
+                'max_waiting': self.max_waiting,
+                'budget': self.budget,
+                'budget_used': self._budget_used(),
+                'seconds_per_unit': {kind: round(rate, 2) for kind, rate in self._rates.items()},
+            }
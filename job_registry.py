@@ -0,0 +1,215 @@
+"""
+Bounded in-memory registry of job progress: least-recently-used and
+expired entries of finished jobs are evicted, and finished results can be
+spilled to disk instead of being dropped
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional
+
+from prepared_json import PreparedJson
+
+logger = logging.getLogger(__name__)
+
+
+def entry_size(entry: Dict[str, Any]) -> int:
+    """Approximate bytes an entry holds; prepared responses count their encoded bodies"""
+    size = 0
+    for key, value in entry.items():
+        if isinstance(value, PreparedJson):
+            size += len(value.body) + len(value.gzipped or b'')
+        else:
+            size += len(key) + len(json.dumps(value, default=str))
+    return size
+
+
+class JobRegistry(MutableMapping):
+    """
+    Job id -> progress dict, bounded by entry count, total size and age
+
+    Entries of jobs whose status is still active are never evicted. When
+    over a bound, finished entries go in least-recently-used order; ones not
+    read or written for `ttl` seconds go regardless. An evicted entry with a
+    prepared response is written to spill_dir if one is configured and read
+    back transparently on its next lookup.
+    """
+
+    def __init__(self, name: str, active_statuses: Collection[str], max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 spill_dir: Optional[str] = None, on_evict: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            name: Label for logs, stats and spill file names
+            active_statuses: Statuses of jobs still running
+            max_entries: Entries kept in memory
+            max_bytes: Approximate bytes kept in memory
+            ttl: Seconds an untouched finished entry is kept, in memory or spilled
+            spill_dir: Directory for finished results evicted from memory; None drops them
+            on_evict: Called with the job id of every entry that is dropped for good
+        """
+        self.name = name
+        self.active_statuses = set(active_statuses)
+        self.max_entries = max_entries or int(os.environ.get('JOB_REGISTRY_MAX_ENTRIES', 200))
+        self.max_bytes = max_bytes or int(float(os.environ.get('JOB_REGISTRY_MAX_MB', 256)) * 1024 * 1024)
+        self.ttl = ttl or float(os.environ.get('JOB_REGISTRY_TTL', 6 * 3600))
+        self.spill_dir = spill_dir if spill_dir is not None else os.environ.get('JOB_SPILL_DIR') or None
+        self.on_evict = on_evict
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        # job id -> (spill file, the entry without its response, last used)
+        self._spilled: Dict[str, tuple] = {}
+        self._evicted = 0
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            if key not in self._entries and key in self._spilled:
+                self._restore(key)
+            entry = self._entries[key]
+            if self._expired(key, entry, time.time()):
+                self._drop(key)
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            self._last_used[key] = time.time()
+            return entry
+
+    def __setitem__(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._remove_spill(key)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._last_used[key] = time.time()
+            self._evict()
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            if key not in self._entries and key not in self._spilled:
+                raise KeyError(key)
+            self._drop(key)
+
+    def __contains__(self, key: object) -> bool:
+        """Whether a lookup would succeed, without reading spilled entries back from disk"""
+        with self._lock:
+            now = time.time()
+            if key in self._entries:
+                return not self._expired(key, self._entries[key], now)
+            if key in self._spilled:
+                return now - self._spilled[key][2] <= self.ttl
+            return False
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def values(self) -> List[Dict[str, Any]]:
+        """In-memory entries, without refreshing their recency"""
+        with self._lock:
+            return list(self._entries.values())
+
+    def _active(self, entry: Dict[str, Any]) -> bool:
+        return entry.get('status') in self.active_statuses
+
+    def _expired(self, key: str, entry: Dict[str, Any], now: float) -> bool:
+        return not self._active(entry) and now - self._last_used.get(key, now) > self.ttl
+
+    def _evict(self, keep: Optional[str] = None):
+        """Bring the registry back within its bounds, leaving the entry `keep` in memory"""
+        now = time.time()
+        for key, entry in list(self._entries.items()):
+            if self._expired(key, entry, now):
+                self._drop(key)
+        for key, (_, _, last_used) in list(self._spilled.items()):
+            if now - last_used > self.ttl:
+                self._drop(key)
+
+        sizes = {key: entry_size(entry) for key, entry in self._entries.items()}
+        total = sum(sizes.values())
+        for key, entry in list(self._entries.items()):
+            if len(self._entries) <= self.max_entries and total <= self.max_bytes:
+                break
+            if self._active(entry) or key == keep:
+                continue
+            total -= sizes[key]
+            if not self._spill(key, entry):
+                self._drop(key)
+            self._evicted += 1
+
+    def _spill(self, key: str, entry: Dict[str, Any]) -> bool:
+        """Move a finished entry's prepared response to disk; False if it cannot be spilled"""
+        response = entry.get('response')
+        if not self.spill_dir or not isinstance(response, PreparedJson):
+            return False
+        path = os.path.join(self.spill_dir, f"{self.name}_{key}.json")
+        try:
+            with open(path, 'wb') as f:
+                f.write(response.body)
+        except OSError as e:
+            logger.warning(f"Could not spill {self.name} job {key}: {str(e)}")
+            return False
+        rest = {k: v for k, v in entry.items() if k != 'response'}
+        self._spilled[key] = (path, rest, self._last_used.pop(key, time.time()))
+        del self._entries[key]
+        logger.debug(f"Spilled {self.name} job {key} to {path}")
+        return True
+
+    def _restore(self, key: str):
+        """Read a spilled entry back into memory"""
+        path, rest, _ = self._spilled.pop(key)
+        try:
+            with open(path, 'rb') as f:
+                body = f.read()
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not restore {self.name} job {key}: {str(e)}")
+            if self.on_evict:
+                self.on_evict(key)
+            return
+        self._entries[key] = {**rest, 'response': PreparedJson.from_body(body)}
+        self._last_used[key] = time.time()
+        # An entry bigger than max_bytes would otherwise be spilled again before it is returned
+        self._evict(keep=key)
+
+    def _remove_spill(self, key: str):
+        spilled = self._spilled.pop(key, None)
+        if spilled and os.path.exists(spilled[0]):
+            os.remove(spilled[0])
+
+    def _drop(self, key: str):
+        """Forget an entry for good, in memory and on disk"""
+        self._entries.pop(key, None)
+        self._last_used.pop(key, None)
+        self._remove_spill(key)
+        if self.on_evict:
+            self.on_evict(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Memory accounting for the stats endpoint"""
+        with self._lock:
+            sizes = [entry_size(entry) for entry in self._entries.values()]
+            spilled_bytes = sum(os.path.getsize(path) for path, _, _ in self._spilled.values()
+                                if os.path.exists(path))
+            return {
+                'entries': len(self._entries),
+                'active': sum(1 for entry in self._entries.values() if self._active(entry)),
+                'bytes': sum(sizes),
+                'largest_bytes': max(sizes, default=0),
+                'spilled': len(self._spilled),
+                'spilled_bytes': spilled_bytes,
+                'evicted': self._evicted,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+            }
@@ -0,0 +1,134 @@
+"""
+Runs a scrape job end to end: streams students to the job's checkpoint,
+records progress in the job store and exports the final workbook. Used both
+by the web app's background threads and by standalone scrape workers.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from job_store import JobStore
+from result_writer import StreamingResultWriter, checkpoint_path_for, export_checkpoint, job_output_path
+from range_planner import SeriesTracker, split_series
+from scraper import StudentResultScraper
+
+logger = logging.getLogger(__name__)
+
+
+def run_scrape_job(job_store: JobStore, scraper: StudentResultScraper, job_id: str, roll_numbers: List[str],
+                   filename: str, upload_folder: str, selected_columns: Optional[List[str]] = None,
+                   resume: bool = False, progress: Optional[Dict[str, Any]] = None,
+                   on_update: Optional[Callable[[], None]] = None):
+    """
+    Scrape a job's roll numbers and save them to upload_folder/job_id/filename
+
+    Args:
+        roll_numbers: Roll numbers still to scrape; when resuming, only the
+            ones left unfinished before the restart
+        resume: Append to the job's existing checkpoint instead of starting over
+        progress: In-memory status dict kept up to date alongside the job store
+        on_update: Called after every change to progress, e.g. to push it to listeners
+    """
+    progress = {} if progress is None else progress
+    heartbeat_stop = threading.Event()
+
+    def update(**fields):
+        progress.update(fields)
+        if on_update:
+            on_update()
+
+    try:
+        update(status='scraping')
+        job_store.update_status(job_id, 'scraping')
+
+        # Keep the job's heartbeat fresh so no other process takes it over
+        def heartbeat():
+            while not heartbeat_stop.wait(job_store.stale_after / 3):
+                job_store.heartbeat(job_id)
+        threading.Thread(target=heartbeat, daemon=True).start()
+
+        already_done = 0
+        if resume:
+            already_done = job_store.get_job(job_id)['completed']
+            logger.info(f"Resuming job {job_id}: {len(roll_numbers)} roll numbers left")
+
+        last_metrics = 0.0
+
+        def progress_callback(completed, total):
+            nonlocal last_metrics
+            if scraper.concurrency is not None:
+                progress['concurrency'] = scraper.concurrency.stats()
+                # Workers in other processes report through the store; once a second is plenty
+                if time.monotonic() - last_metrics >= 1:
+                    last_metrics = time.monotonic()
+                    job_store.record_metrics(job_id, progress['concurrency'])
+            update(completed=already_done + completed)
+
+        def roll_callback(roll_number):
+            job_store.mark_done(job_id, roll_number)
+
+        # Stream each student to an on-disk checkpoint as soon as it is scraped
+        output_path = job_output_path(upload_folder, job_id, filename)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        checkpoint_path = checkpoint_path_for(output_path)
+        with StreamingResultWriter(checkpoint_path, resume=resume) as writer:
+            update(scraped=writer.count)
+            for student in scraper.scrape_stream(roll_numbers, progress_callback=progress_callback,
+                                                 roll_callback=roll_callback):
+                writer.append(student)
+                update(scraped=writer.count)
+                job_store.record_scraped(job_id, writer.count)
+
+        update(status='saving')
+        job_store.update_status(job_id, 'saving')
+        export_checkpoint(checkpoint_path, output_path, selected_columns=selected_columns)
+
+        job_store.update_status(job_id, 'completed')
+        update(status='completed', file_path=output_path)
+
+    except Exception as e:
+        logger.error(f"Scraping task error: {str(e)}")
+        job_store.update_status(job_id, 'error', str(e))
+        update(status='error', error=str(e))
+    finally:
+        heartbeat_stop.set()
+
+
+def run_claimed_job(job_store: JobStore, job: Dict[str, Any], upload_folder: str, resume: bool,
+                    progress: Optional[Dict[str, Any]] = None, on_update: Optional[Callable[[], None]] = None,
+                    browser_limit: Optional[int] = None):
+    """Run a job taken from the store, either fresh off the queue or a stale one being resumed"""
+    scraper = StudentResultScraper(engine=job['engine'], force_refresh=job['force_refresh'],
+                                   series_tracker=series_tracker_for(job_store, job))
+    scraper.browser_limit = browser_limit
+    run_scrape_job(job_store, scraper, job['id'], job_store.remaining_rolls(job['id']), job['filename'],
+                   upload_folder, job['selected_columns'], resume=resume, progress=progress, on_update=on_update)
+
+
+def series_tracker_for(job_store: JobStore, job: Dict[str, Any]) -> Optional[SeriesTracker]:
+    """Early-termination tracker for a stored job, or None when it scrapes every roll number"""
+    if not job['series'] or job['miss_limit'] <= 0:
+        return None
+    return SeriesTracker(split_series(job_store.all_rolls(job['id']), job['series']), job['miss_limit'])
+
+
+def progress_from_job(job: Dict[str, Any], upload_folder: str) -> Dict[str, Any]:
+    """Status dict in the shape the progress page polls for, built from a stored job"""
+    progress = {
+        'total': job['total'],
+        'completed': job['completed'],
+        'scraped': job['scraped'],
+        'status': job['status'],
+        'filename': job['filename'],
+        'selected_columns': job['selected_columns'],
+    }
+    if job['metrics']:
+        progress['concurrency'] = job['metrics']
+    if job['error']:
+        progress['error'] = job['error']
+    if job['status'] == 'completed':
+        progress['file_path'] = job_output_path(upload_folder, job['id'], job['filename'])
+    return progress
@@ -0,0 +1,255 @@
+"""
+SQLite-backed store for scrape jobs so unfinished jobs survive worker
+restarts and redeploys and can be resumed from where they stopped.
+It doubles as the job queue consumed by standalone scrape workers.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('starting', 'scraping', 'saving')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    selected_columns TEXT,
+    engine TEXT NOT NULL DEFAULT 'selenium',
+    force_refresh INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL,
+    scraped INTEGER NOT NULL DEFAULT 0,
+    metrics TEXT,
+    series TEXT,
+    miss_limit INTEGER NOT NULL DEFAULT 0,
+    priority INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    owner TEXT,
+    heartbeat REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scrape_job_rolls (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    roll_number TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_scrape_job_rolls_pending ON scrape_job_rolls (job_id, done);
+CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status ON scrape_jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_scrape_jobs_queue ON scrape_jobs (status, priority, created_at);
+"""
+
+# Columns added after the first release, for databases created before them
+MIGRATIONS = {
+    'force_refresh': "ALTER TABLE scrape_jobs ADD COLUMN force_refresh INTEGER NOT NULL DEFAULT 0",
+    'scraped': "ALTER TABLE scrape_jobs ADD COLUMN scraped INTEGER NOT NULL DEFAULT 0",
+    'metrics': "ALTER TABLE scrape_jobs ADD COLUMN metrics TEXT",
+    'series': "ALTER TABLE scrape_jobs ADD COLUMN series TEXT",
+    'miss_limit': "ALTER TABLE scrape_jobs ADD COLUMN miss_limit INTEGER NOT NULL DEFAULT 0",
+    'priority': "ALTER TABLE scrape_jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0",
+}
+
+
+class JobStore:
+    """Persist scrape jobs, their roll numbers and which ones are finished"""
+
+    def __init__(self, db_path: Optional[str] = None, stale_after: Optional[float] = None):
+        """
+        Args:
+            db_path: SQLite database file
+            stale_after: Seconds without a heartbeat after which another
+                process may take over an active job
+        """
+        self.db_path = db_path or os.environ.get('JOB_STORE_PATH', 'jobs.db')
+        self.stale_after = stale_after or float(os.environ.get('JOB_STALE_AFTER', 120))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._local = threading.local()
+        with self._connect() as conn:
+            existing = {row['name'] for row in conn.execute("PRAGMA table_info(scrape_jobs)")}
+            if existing:
+                for column, statement in MIGRATIONS.items():
+                    if column not in existing:
+                        conn.execute(statement)
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """One connection per thread, committed per operation"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # WAL needs shared memory, so every process using the store must be on this host
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    def create_job(self, job_id: str, roll_numbers: List[str], filename: str,
+                   selected_columns: Optional[List[str]] = None, engine: str = 'selenium',
+                   force_refresh: bool = False, queued: bool = False,
+                   series_sizes: Optional[List[int]] = None, miss_limit: int = 0, priority: int = 0):
+        """
+        Record a new job
+
+        Args:
+            queued: Leave the job unowned for a worker to claim instead of
+                running it in this process
+            series_sizes: Lengths of the consecutive series roll_numbers is made of
+            miss_limit: Consecutive missing students after which a series is abandoned
+            priority: Queued jobs with a lower value are claimed first
+        """
+        now = time.time()
+        status, owner = ('queued', None) if queued else ('starting', self.owner)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO scrape_jobs (id, status, filename, selected_columns, engine, force_refresh, total, "
+                "series, miss_limit, priority, owner, heartbeat, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, status, filename, json.dumps(selected_columns), engine, int(force_refresh),
+                 len(roll_numbers), json.dumps(series_sizes) if series_sizes else None, miss_limit,
+                 priority, owner, now, now)
+            )
+            conn.executemany(
+                "INSERT INTO scrape_job_rolls (job_id, position, roll_number) VALUES (?, ?, ?)",
+                [(job_id, i, roll_number) for i, roll_number in enumerate(roll_numbers)]
+            )
+
+    def mark_done(self, job_id: str, roll_number: str):
+        """Record that a roll number is finished (scraped or confirmed missing)"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE scrape_job_rolls SET done = 1 WHERE job_id = ? AND roll_number = ?",
+                (job_id, roll_number)
+            )
+            conn.execute("UPDATE scrape_jobs SET heartbeat = ? WHERE id = ?", (time.time(), job_id))
+
+    def record_scraped(self, job_id: str, scraped: int):
+        """Record how many students a job has written to its checkpoint"""
+        with self._connect() as conn:
+            conn.execute("UPDATE scrape_jobs SET scraped = ? WHERE id = ?", (scraped, job_id))
+
+    def record_metrics(self, job_id: str, metrics: Dict[str, Any]):
+        """Record live scraping statistics (e.g. current concurrency) for status reporting"""
+        with self._connect() as conn:
+            conn.execute("UPDATE scrape_jobs SET metrics = ? WHERE id = ?", (json.dumps(metrics), job_id))
+
+    def heartbeat(self, job_id: str):
+        """Mark a job as still being worked on by its owner"""
+        with self._connect() as conn:
+            conn.execute("UPDATE scrape_jobs SET heartbeat = ? WHERE id = ?", (time.time(), job_id))
+
+    def update_status(self, job_id: str, status: str, error: Optional[str] = None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE scrape_jobs SET status = ?, error = ?, heartbeat = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM scrape_jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            done = conn.execute(
+                "SELECT COUNT(*) FROM scrape_job_rolls WHERE job_id = ? AND done = 1", (job_id,)
+            ).fetchone()[0]
+        job = dict(row)
+        job['selected_columns'] = json.loads(job['selected_columns']) if job['selected_columns'] else None
+        job['force_refresh'] = bool(job['force_refresh'])
+        job['metrics'] = json.loads(job['metrics']) if job['metrics'] else None
+        job['series'] = json.loads(job['series']) if job['series'] else None
+        job['completed'] = done
+        return job
+
+    def all_rolls(self, job_id: str) -> List[str]:
+        """Every roll number of a job, in original order"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT roll_number FROM scrape_job_rolls WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        return [row['roll_number'] for row in rows]
+
+    def remaining_rolls(self, job_id: str) -> List[str]:
+        """Roll numbers of a job that still need scraping, in original order"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT roll_number FROM scrape_job_rolls WHERE job_id = ? AND done = 0 ORDER BY position",
+                (job_id,)
+            ).fetchall()
+        return [row['roll_number'] for row in rows]
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based place of a queued job in the order workers claim them, or None if it isn't queued"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM scrape_jobs q, scrape_jobs j WHERE j.id = ? AND j.status = 'queued' "
+                "AND q.status = 'queued' AND (q.priority, q.created_at) <= (j.priority, j.created_at)",
+                (job_id,)
+            ).fetchone()
+        return row[0] or None
+
+    def claim_stale_jobs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Take ownership of active jobs whose owner stopped heartbeating
+
+        The conditional UPDATE makes the claim atomic, so when several
+        processes start together each stale job is resumed exactly once.
+
+        Args:
+            limit: Claim at most this many jobs, leaving the rest to other
+                processes
+        """
+        now = time.time()
+        with self._connect() as conn:
+            candidates = conn.execute(
+                f"SELECT id FROM scrape_jobs WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))}) AND heartbeat < ? "
+                f"ORDER BY created_at",
+                (*ACTIVE_STATUSES, now - self.stale_after)
+            ).fetchall()
+
+        claimed = []
+        for row in candidates:
+            if limit is not None and len(claimed) >= limit:
+                break
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    "UPDATE scrape_jobs SET owner = ?, heartbeat = ? WHERE id = ? AND heartbeat < ?",
+                    (self.owner, now, row['id'], now - self.stale_after)
+                )
+            if cursor.rowcount == 1:
+                claimed.append(self.get_job(row['id']))
+        return claimed
+
+    def claim_next_job(self) -> Optional[Dict[str, Any]]:
+        """
+        Take the most urgent queued job, oldest first within a priority, or None when the queue is empty
+
+        As with stale jobs, the conditional UPDATE guarantees a queued job is
+        handed to exactly one worker even when many poll at once.
+        """
+        while True:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT id FROM scrape_jobs WHERE status = 'queued' ORDER BY priority, created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                cursor = conn.execute(
+                    "UPDATE scrape_jobs SET status = 'starting', owner = ?, heartbeat = ? "
+                    "WHERE id = ? AND status = 'queued'",
+                    (self.owner, time.time(), row['id'])
+                )
+            if cursor.rowcount == 1:
+                return self.get_job(row['id'])
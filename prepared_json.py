@@ -0,0 +1,57 @@
+"""
+JSON responses serialized once and served many times: the encoded body,
+an optional gzip copy and an ETag so unchanged data is answered with 304
+"""
+
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from flask import Response, request
+
+# Bodies smaller than this gain nothing from compression
+GZIP_MIN_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class PreparedJson:
+    """A ready-to-send JSON body"""
+    body: bytes
+    etag: str
+    gzipped: Optional[bytes] = None
+
+    @classmethod
+    def from_data(cls, data: Any) -> 'PreparedJson':
+        """Serialize JSON-compatible data (see make_json_serializable)"""
+        return cls.from_body(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    @classmethod
+    def from_body(cls, body: bytes) -> 'PreparedJson':
+        """Wrap an already-encoded JSON body"""
+        gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+        return cls(body=body, etag=hashlib.sha1(body).hexdigest(), gzipped=gzipped)
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8')
+
+    def response(self) -> Response:
+        """Response for the current request: 304 when the client's copy is current, gzip when accepted"""
+        use_gzip = self.gzipped is not None and request.accept_encodings['gzip'] > 0
+        # Each encoding is a different representation, so it gets its own tag
+        etag = f"{self.etag}-gzip" if use_gzip else self.etag
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(self.gzipped if use_gzip else self.body, mimetype='application/json')
+            if use_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        # Let clients keep the body but check back, which costs a 304 when nothing changed
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
@@ -0,0 +1,73 @@
+"""
+In-process publish/subscribe for job progress, backing the Server-Sent
+Events endpoints so dashboards are pushed updates instead of polling
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Collection, Dict, Iterator, Optional, Union
+
+from prepared_json import PreparedJson
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressBroker:
+    """Version counter per job that waiting streams are woken on"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._cond = threading.Condition()
+
+    def publish(self, key: str):
+        """Signal that a job's progress changed"""
+        with self._cond:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._cond.notify_all()
+
+    def wait(self, key: str, seen_version: int, timeout: float) -> int:
+        """Block until the job's version moves past seen_version or timeout passes; returns the current version"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._versions.get(key, 0) != seen_version, timeout)
+            return self._versions.get(key, 0)
+
+    def discard(self, key: str):
+        with self._cond:
+            self._versions.pop(key, None)
+
+
+def event_stream(broker: ProgressBroker, key: str,
+                 snapshot: Callable[[], Optional[Union[Dict[str, Any], PreparedJson]]],
+                 active_statuses: Collection[str], refresh_interval: float = 15) -> Iterator[str]:
+    """
+    Server-Sent Events for one job: a message whenever its state changes
+
+    Args:
+        snapshot: Returns the job's current state, or None if it is unknown;
+            a PreparedJson is a final state, sent as serialized and ending the stream
+        active_statuses: Statuses after which more updates will follow; the
+            stream ends once it has sent a state outside them
+        refresh_interval: Seconds between re-checks when nothing is published,
+            for state kept outside this process, doubling as a keep-alive
+    """
+    version = broker.wait(key, -1, 0)
+    last_payload = None
+    while True:
+        state = snapshot()
+        if state is None:
+            yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
+            return
+
+        final = isinstance(state, PreparedJson)
+        payload = state.text if final else json.dumps(state)
+        if payload != last_payload:
+            yield f"data: {payload}\n\n"
+            last_payload = payload
+        else:
+            yield ": keep-alive\n\n"
+
+        if final or state.get('status') not in active_statuses:
+            return
+
+        version = broker.wait(key, version, refresh_interval)
@@ -0,0 +1,214 @@
+"""
+Roll-number range planning: expands From/To ranges with numeric or
+alphanumeric suffixes, parses multi-section range lists, and tracks
+consecutive missing students so a series stops being probed past its end
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Digits sort before letters, so a serial can continue ...98, 99, A0, A1
+ALPHANUMERIC = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+MAX_PLAN_SIZE = 5000
+SERIAL = re.compile(r'^(.*?)(\d+)$')
+
+
+class RangeError(ValueError):
+    """A range or range list that cannot be expanded"""
+
+
+def expand_range(start: str, end: str) -> List[str]:
+    """
+    Every roll number from start to end inclusive
+
+    The part after the common prefix is treated as a counter. Positions
+    where both ends are digits count 0-9; any other position counts 0-9
+    then A-Z, so 23EG106D01-23EG106D99, 23EG106D001-23EG106D150 and
+    21XX1A0590-21XX1A05B5 all expand as expected. Ends of different
+    lengths are allowed when only their trailing serial differs, as in
+    23EG106D01-23EG106D120.
+    """
+    start, end = start.strip().upper(), end.strip().upper()
+    if not start or not end:
+        raise RangeError("Both From and To roll numbers are required")
+    if not (start + end).isalnum():
+        raise RangeError(f"Roll numbers may only contain letters and digits: {start}, {end}")
+    if len(start) != len(end):
+        return _expand_serial(start, end)
+
+    split = next((i for i, (a, b) in enumerate(zip(start, end)) if a != b), len(start))
+    prefix, low, high = start[:split], start[split:], end[split:]
+    if not low:
+        return [start]
+
+    radices = [10 if a.isdigit() and b.isdigit() else 36 for a, b in zip(low, high)]
+    first, last = _to_number(low, radices), _to_number(high, radices)
+    if first > last:
+        raise RangeError(f"From roll number {start} comes after To roll number {end}")
+    if last - first + 1 > MAX_PLAN_SIZE:
+        raise RangeError(f"{start}-{end} spans more than {MAX_PLAN_SIZE} roll numbers")
+
+    return [prefix + _from_number(n, radices) for n in range(first, last + 1)]
+
+
+def _expand_serial(start: str, end: str) -> List[str]:
+    """Expand a range whose ends differ only in a trailing serial of different widths"""
+    start_match, end_match = SERIAL.match(start), SERIAL.match(end)
+    if not (start_match and end_match and start_match.group(1) == end_match.group(1)):
+        raise RangeError(f"{start} and {end} must have the same number of characters")
+
+    prefix, width = start_match.group(1), len(start_match.group(2))
+    first, last = int(start_match.group(2)), int(end_match.group(2))
+    if first > last:
+        raise RangeError(f"From roll number {start} comes after To roll number {end}")
+    if last - first + 1 > MAX_PLAN_SIZE:
+        raise RangeError(f"{start}-{end} spans more than {MAX_PLAN_SIZE} roll numbers")
+    return [f"{prefix}{str(n).zfill(width)}" for n in range(first, last + 1)]
+
+
+def _to_number(suffix: str, radices: List[int]) -> int:
+    value = 0
+    for char, radix in zip(suffix, radices):
+        value = value * radix + ALPHANUMERIC.index(char)
+    return value
+
+
+def _from_number(value: int, radices: List[int]) -> str:
+    chars = []
+    for radix in reversed(radices):
+        value, digit = divmod(value, radix)
+        chars.append(ALPHANUMERIC[digit])
+    return ''.join(reversed(chars))
+
+
+def parse_range_list(text: str) -> List[List[str]]:
+    """
+    Expand a list of ranges and single roll numbers into series
+
+    Entries are separated by commas, semicolons or new lines; a range is
+    written FROM-TO. Each entry becomes its own series, so sections are
+    probed (and given up on) independently. Repeated roll numbers are kept
+    only where they first appear.
+    """
+    series, seen = [], set()
+    for entry in re.split(r'[,;\n]+', text):
+        entry = entry.strip()
+        if not entry:
+            continue
+        bounds = [part for part in re.split(r'\s*-\s*', entry) if part]
+        if len(bounds) == 1:
+            rolls = [bounds[0].upper()]
+        elif len(bounds) == 2:
+            rolls = expand_range(*bounds)
+        else:
+            raise RangeError(f"Cannot read range '{entry}'; use FROM-TO")
+
+        rolls = [roll for roll in rolls if roll not in seen]
+        seen.update(rolls)
+        if rolls:
+            series.append(rolls)
+
+    if sum(len(rolls) for rolls in series) > MAX_PLAN_SIZE:
+        raise RangeError(f"Ranges span more than {MAX_PLAN_SIZE} roll numbers")
+    return series
+
+
+def split_series(roll_numbers: List[str], sizes: List[int]) -> List[List[str]]:
+    """Rebuild series from a flat roll number list and the size of each series"""
+    series, offset = [], 0
+    for size in sizes:
+        series.append(roll_numbers[offset:offset + size])
+        offset += size
+    return series
+
+
+class SeriesTracker:
+    """
+    Decides when to stop probing a series after consecutive missing students
+
+    Results arrive out of order from parallel workers, so a run is counted
+    over finished positions; once miss_limit adjacent positions are confirmed
+    missing, and no student was found past them, everything after that run
+    is skipped. A student found beyond the stop point reopens the series.
+    Failed lookups (errors rather than "no such student") are never recorded
+    and never end a series.
+    """
+
+    def __init__(self, series: List[List[str]], miss_limit: int):
+        self.miss_limit = miss_limit
+        self._position: Dict[str, Tuple[int, int]] = {}
+        for series_index, rolls in enumerate(series):
+            for index, roll_number in enumerate(rolls):
+                self._position[roll_number.upper()] = (series_index, index)
+        self._series = series
+        self._outcomes: List[Dict[int, bool]] = [{} for _ in series]
+        self._stop_after: List[Optional[int]] = [None] * len(series)
+        self._last_found: List[int] = [-1] * len(series)
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    def record(self, roll_number: str, found: bool):
+        """Note whether a roll number turned out to exist"""
+        position = self._position.get(roll_number.upper())
+        if position is None or self.miss_limit <= 0:
+            return
+        series_index, index = position
+
+        with self._lock:
+            outcomes = self._outcomes[series_index]
+            outcomes[index] = found
+            if found:
+                if index > self._last_found[series_index]:
+                    self._last_found[series_index] = index
+                    stop = self._stop_after[series_index]
+                    if stop is not None and index > stop:
+                        # Workers finish out of order: the gap was not the end of the series
+                        logger.info(f"Found {roll_number} past the end of its series, resuming it")
+                        self._stop_after[series_index] = self._first_stop(series_index)
+                return
+
+            low = high = index
+            while outcomes.get(low - 1) is False:
+                low -= 1
+            while outcomes.get(high + 1) is False:
+                high += 1
+
+            stop = self._stop_after[series_index]
+            if (high - low + 1 >= self.miss_limit and low > self._last_found[series_index]
+                    and (stop is None or high < stop)):
+                self._stop_after[series_index] = high
+                rolls = self._series[series_index]
+                if high + 1 < len(rolls):
+                    logger.info(f"{self.miss_limit} consecutive missing roll numbers up to {rolls[high]}; "
+                                f"skipping {rolls[high + 1]}-{rolls[-1]}")
+
+    def _first_stop(self, series_index: int) -> Optional[int]:
+        """End of the first run of miss_limit misses after the last found position, if any"""
+        outcomes = self._outcomes[series_index]
+        run, end = 0, None
+        # Only misses lie beyond the last found position
+        for index in sorted(i for i in outcomes if i > self._last_found[series_index]):
+            if end is not None and index != end + 1:
+                if run >= self.miss_limit:
+                    break
+                run = 0
+            run += 1
+            end = index
+        return end if run >= self.miss_limit else None
+
+    def should_skip(self, roll_number: str) -> bool:
+        """Whether a roll number lies past the end of its series"""
+        position = self._position.get(roll_number.upper())
+        if position is None:
+            return False
+        series_index, index = position
+        with self._lock:
+            stop = self._stop_after[series_index]
+            if stop is not None and index > stop:
+                self.skipped += 1
+                return True
+        return False
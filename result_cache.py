@@ -0,0 +1,158 @@
+"""
+Persistent cache of parsed student results keyed by roll number, with a
+TTL for freshness and least-recently-used eviction to bound its size, plus
+a short-lived negative cache of roll numbers the portal has no result for
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS student_results (
+    roll_number TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_student_results_last_used ON student_results (last_used);
+CREATE TABLE IF NOT EXISTS missing_students (
+    roll_number TEXT PRIMARY KEY,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+class ResultCache:
+    """SQLite-backed roll number -> result record cache"""
+
+    def __init__(self, db_path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None, missing_ttl: Optional[float] = None):
+        """
+        Args:
+            db_path: SQLite database file
+            ttl: Seconds a cached result stays fresh
+            max_entries: Entries kept before least recently used ones are evicted
+            missing_ttl: Seconds a roll number without a result is trusted to stay missing
+        """
+        self.db_path = db_path or os.environ.get('RESULT_CACHE_PATH', 'results_cache.db')
+        self.ttl = ttl or float(os.environ.get('RESULT_CACHE_TTL', 24 * 3600))
+        self.max_entries = max_entries or int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 20000))
+        self.missing_ttl = missing_ttl or float(os.environ.get('RESULT_CACHE_MISSING_TTL', 15 * 60))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """One connection per thread, committed per operation"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    def get_many(self, roll_numbers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fresh cached records for the given roll numbers, touching their LRU timestamp"""
+        if not roll_numbers:
+            return {}
+
+        now = time.time()
+        found = {}
+        with self._connect() as conn:
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(roll_numbers), 500):
+                batch = roll_numbers[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT roll_number, payload FROM student_results "
+                    f"WHERE roll_number IN ({','.join('?' * len(batch))}) AND fetched_at >= ?",
+                    (*batch, now - self.ttl)
+                ).fetchall()
+                found.update((roll_number, json.loads(payload)) for roll_number, payload in rows)
+
+            if found:
+                conn.executemany(
+                    "UPDATE student_results SET last_used = ? WHERE roll_number = ?",
+                    [(now, roll_number) for roll_number in found]
+                )
+        return found
+
+    def get_missing(self, roll_numbers: List[str]) -> Set[str]:
+        """Roll numbers recently confirmed to have no result"""
+        if not roll_numbers:
+            return set()
+
+        missing = set()
+        with self._connect() as conn:
+            for i in range(0, len(roll_numbers), 500):
+                batch = roll_numbers[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT roll_number FROM missing_students "
+                    f"WHERE roll_number IN ({','.join('?' * len(batch))}) AND checked_at >= ?",
+                    (*batch, time.time() - self.missing_ttl)
+                ).fetchall()
+                missing.update(roll_number for roll_number, in rows)
+        return missing
+
+    def put_missing(self, roll_number: str):
+        """Remember that the portal has no result for a roll number"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO missing_students (roll_number, checked_at) VALUES (?, ?)",
+                (roll_number, time.time())
+            )
+
+    def put(self, roll_number: str, record: Dict[str, Any]):
+        """Store a freshly fetched record"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO student_results (roll_number, payload, fetched_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (roll_number, json.dumps(record, ensure_ascii=False), now, now)
+            )
+            conn.execute("DELETE FROM missing_students WHERE roll_number = ?", (roll_number,))
+
+        # Evicting on every write would be wasteful; do it in batches
+        with self._lock:
+            self._puts_since_evict += 1
+            due = self._puts_since_evict >= 100
+            if due:
+                self._puts_since_evict = 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used beyond max_entries"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM student_results WHERE fetched_at < ?", (time.time() - self.ttl,))
+            conn.execute("DELETE FROM missing_students WHERE checked_at < ?", (time.time() - self.missing_ttl,))
+            count = conn.execute("SELECT COUNT(*) FROM student_results").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM student_results WHERE roll_number IN "
+                    "(SELECT roll_number FROM student_results ORDER BY last_used ASC LIMIT ?)",
+                    (excess,)
+                )
+                logger.info(f"Evicted {excess} cached results")
+
+    def invalidate(self, roll_numbers: List[str]):
+        """Forget cached records so they are fetched again"""
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM student_results WHERE roll_number = ?",
+                             [(roll_number,) for roll_number in roll_numbers])
+            conn.executemany("DELETE FROM missing_students WHERE roll_number = ?",
+                             [(roll_number,) for roll_number in roll_numbers])
@@ -0,0 +1,181 @@
+"""
+Streaming result sink: appends each scraped student to a JSONL checkpoint
+and exports the checkpoint to Excel with xlsxwriter in constant-memory mode
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict
+from typing import Iterator, List, Optional, Tuple
+
+import xlsxwriter
+
+from scraper import StudentResult, build_excel_row, roll_sort_key
+
+logger = logging.getLogger(__name__)
+
+
+def job_output_path(upload_folder: str, job_id: str, filename: str) -> str:
+    """
+    Workbook a scrape job exports to, in a folder of its own
+
+    Users pick the filename and often keep the default, so jobs sharing a
+    folder would truncate and interleave each other's checkpoints.
+    """
+    return os.path.join(upload_folder, job_id, filename)
+
+
+def checkpoint_path_for(output_path: str) -> str:
+    """JSONL checkpoint kept next to an Excel export"""
+    return os.path.splitext(output_path)[0] + '.jsonl'
+
+
+class StreamingResultWriter:
+    """Append-only JSONL checkpoint of scraped students"""
+
+    def __init__(self, checkpoint_path: str, resume: bool = False):
+        """
+        Args:
+            checkpoint_path: JSONL file to append students to
+            resume: Keep existing records instead of truncating the file
+        """
+        self.checkpoint_path = checkpoint_path
+        self._lock = threading.Lock()
+        self._file = open(checkpoint_path, 'a' if resume else 'w', encoding='utf-8')
+        self.count = sum(1 for _ in iter_checkpoint(checkpoint_path)) if resume else 0
+
+    def append(self, student: StudentResult):
+        """Persist one student immediately so a crash loses nothing already scraped"""
+        line = json.dumps(asdict(student), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_checkpoint(checkpoint_path: str) -> Iterator[StudentResult]:
+    """Read students back from a checkpoint, skipping a torn final line"""
+    if not os.path.exists(checkpoint_path):
+        return
+    with open(checkpoint_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield StudentResult(**json.loads(line))
+            except (ValueError, TypeError):
+                logger.warning(f"Skipping unreadable checkpoint line in {checkpoint_path}")
+
+
+def _sorted_offsets(checkpoint_path: str) -> List[Tuple[tuple, int]]:
+    """
+    Roll-number sort keys and byte offsets of every checkpoint line
+
+    A student appended twice (e.g. re-scraped after a resume) keeps only its
+    latest line.
+    """
+    latest = {}
+    with open(checkpoint_path, 'rb') as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            try:
+                hall_ticket_number = json.loads(line)['hall_ticket_number']
+            except (ValueError, KeyError):
+                continue
+            latest[hall_ticket_number] = offset
+    return sorted((roll_sort_key(hall_ticket_number), offset) for hall_ticket_number, offset in latest.items())
+
+
+def export_checkpoint(checkpoint_path: str, output_path: str, selected_columns: Optional[List[str]] = None) -> int:
+    """
+    Write the students in a checkpoint to Excel, sorted by roll number
+
+    Only sort keys and file offsets are held in memory; rows are streamed to
+    a constant-memory workbook in the same layout as save_to_excel. The file
+    is written under a temporary name and renamed so downloads never see a
+    half-written workbook.
+
+    Returns:
+        Number of students written
+    """
+    offsets = _sorted_offsets(checkpoint_path) if os.path.exists(checkpoint_path) else []
+    if not offsets:
+        raise ValueError("No results to save")
+
+    logger.info(f"Saving {len(offsets)} results to {output_path}")
+    tmp_path = f"{output_path}.{threading.get_ident()}.tmp"
+    workbook = xlsxwriter.Workbook(tmp_path, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Student Results')
+    header_format = workbook.add_format({
+        'bold': True,
+        'text_wrap': True,
+        'valign': 'top',
+        'fg_color': '#D7E4BC',
+        'border': 1
+    })
+
+    columns = None
+    with open(checkpoint_path, 'rb') as f:
+        for row_num, (_, offset) in enumerate(offsets, start=3):
+            f.seek(offset)
+            student = StudentResult(**json.loads(f.readline()))
+            row = build_excel_row(student, selected_columns)
+
+            if columns is None:
+                # Column layout follows the first student, as in save_to_excel
+                columns = list(row.keys())
+                _write_header(worksheet, columns, header_format)
+
+            worksheet.write(row_num, 0, row_num - 2)
+            for col_num, column in enumerate(columns, start=1):
+                value = row.get(column)
+                if value is not None and value != '':
+                    worksheet.write(row_num, col_num, value)
+
+    workbook.close()
+    os.replace(tmp_path, output_path)
+    logger.info(f"Results successfully saved to {output_path}")
+    return len(offsets)
+
+
+def _write_header(worksheet, columns: List[tuple], header_format):
+    """Two header rows plus a blank index-name row, matching pandas' MultiIndex output"""
+    worksheet.set_column(0, len(columns), 12)
+
+    # Group consecutive course columns so their name spans Grade/Status/Credits
+    spans = []
+    col_num = 0
+    while col_num < len(columns):
+        field, detail = columns[col_num]
+        span = 1
+        while (detail and col_num + span < len(columns)
+               and columns[col_num + span][0] == field and columns[col_num + span][1]):
+            span += 1
+        spans.append((col_num + 1, span, str(field)))
+        col_num += span
+
+    # Constant-memory worksheets flush each row once a later row is written
+    worksheet.write(0, 0, "Course/Field", header_format)
+    for first_col, span, field in spans:
+        if span > 1:
+            worksheet.merge_range(0, first_col, 0, first_col + span - 1, field, header_format)
+        else:
+            worksheet.write(0, first_col, field, header_format)
+
+    worksheet.write(1, 0, "Detail", header_format)
+    for col_num, (_, detail) in enumerate(columns, start=1):
+        worksheet.write(1, col_num, str(detail), header_format)
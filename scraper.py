@@ -10,17 +10,30 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException
+from selenium.webdriver.common.keys import Keys
+from requests.exceptions import Timeout as RequestTimeout
 from webdriver_manager.chrome import ChromeDriverManager
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import time
 import random
-from typing import List, Dict, Any, Optional, Callable
-from dataclasses import dataclass
+import re
+from typing import List, Dict, Any, Optional, Callable, Iterator
+from dataclasses import dataclass, asdict
 import os
 import xlsxwriter
+import threading
+import queue
 from datetime import datetime
+from functools import lru_cache, partial
+from driver_pool import DriverPool
+from http_fetcher import NO_RESULT_PHRASES, HttpResultFetcher, ResultNotFound
+from async_scraper import AsyncResultEngine
+from result_cache import ResultCache
+from concurrency_controller import AdaptiveConcurrency, backoff_delay
+from range_planner import SeriesTracker
+from single_flight import FAILED, SingleFlight
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -78,10 +91,147 @@ class StudentResult:
     def sem4_sgpa(self):
         return self.semester_sgpa.get('sem4', 'N/A')
 
+def roll_sort_key(hall_ticket_number: Any) -> tuple:
+    """Natural sort key for roll numbers: sections group together and serials sort numerically, 99 before 100"""
+    return tuple((0, int(chunk), '') if chunk.isdigit() else (1, 0, chunk)
+                 for chunk in re.findall(r'\d+|\D+', str(hall_ticket_number).upper()))
+
+def build_excel_row(student: StudentResult, selected_columns: Optional[List[str]] = None) -> Dict[tuple, Any]:
+    """Flatten a student into the two-level (field, detail) columns of the Excel export"""
+    student_row = {
+        ("Hall Ticket Number", ""): student.hall_ticket_number,
+        ("Student Name", ""): student.student_name,
+        ("Program", ""): student.program,
+        ("Branch", ""): student.branch,
+        ("Section", ""): student.section,
+        ("CGPA", ""): student.cgpa,
+        ("No of Backlogs", ""): student.backlog_count
+    }
+
+    # Add semester details
+    for sem_name, sem_data in [
+        ("Sem1 Details", student.sem1_details),
+        ("Sem2 Details", student.sem2_details),
+        ("Sem3 Details", student.sem3_details),
+        ("Sem4 Details", student.sem4_details)
+    ]:
+        if selected_columns is None or sem_name in selected_columns:
+            for course in sem_data:
+                course_name = course.get("Course Name", "Unknown Course")
+                student_row[(course_name, "Grade")] = course.get("Grade", "")
+                student_row[(course_name, "Status")] = course.get("Status", "")
+                student_row[(course_name, "Credits")] = course.get("Credits", "")
+
+    # Add SGPA values if semN SGPA is selected
+    if selected_columns is None or "Sem1 Details" in selected_columns:
+        student_row[("Sem1 SGPA", "")] = student.sem1_sgpa
+    if selected_columns is None or "Sem2 Details" in selected_columns:
+        student_row[("Sem2 SGPA", "")] = student.sem2_sgpa
+    if selected_columns is None or "Sem3 Details" in selected_columns:
+        student_row[("Sem3 SGPA", "")] = student.sem3_sgpa
+    if selected_columns is None or "Sem4 Details" in selected_columns:
+        student_row[("Sem4 SGPA", "")] = student.sem4_sgpa
+
+    return student_row
+
+RESULT_CONTAINER_XPATH = "//*[@id='root']/div[2]/div[2]/div[2]/div/div[2]"
+RESULT_HALL_TICKET_XPATH = RESULT_CONTAINER_XPATH + "/div[1]/div[1]/p"
+
+# The portal reports an unknown roll number in a toast/alert rather than a result block
+_LOWERCASE_TEXT = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+NO_RESULT_XPATH = (
+    "//*[@role='alert' or contains(@class, 'MuiAlert') or contains(@class, 'MuiSnackbar') "
+    "or contains(@class, 'Toastify') or contains(@class, 'notistack')]"
+    "[" + " or ".join(f"contains({_LOWERCASE_TEXT}, '{phrase}')" for phrase in NO_RESULT_PHRASES) + "]"
+)
+
+# Requests dropped by the browser in lean-page mode; the portal styles its
+# components with CSS-in-JS, so external stylesheets are only web fonts
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.css',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*hotjar.com*', '*clarity.ms*', '*facebook.net*', '*fonts.googleapis.com*'
+]
+
+# Collects everything _extract_student_data needs in one execute_script call
+# instead of one WebDriver round trip per element and table cell. Returns
+# null when the header block is missing so the caller can fall back.
+RESULT_SNAPSHOT_SCRIPT = r"""
+const base = "//*[@id='root']/div[2]/div[2]/div[2]/div/div[2]";
+const textAt = (xpath) => {
+    const node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return node ? node.innerText.trim() : null;
+};
+const header = {
+    studentName: textAt(base + "/div[1]/div[2]/p"),
+    hallTicketNumber: textAt(base + "/div[1]/div[1]/p"),
+    program: textAt(base + "/div[1]/div[3]/p"),
+    cgpa: textAt(base + "/div[2]")
+};
+if (Object.values(header).some((value) => value === null)) {
+    return null;
+}
+const tables = Array.from(document.getElementsByClassName('css-1n196hx')).map((table) => ({
+    headers: Array.from(table.querySelectorAll('th')).map((th) => th.innerText.trim()),
+    rows: Array.from(table.querySelectorAll('tr')).map(
+        (tr) => Array.from(tr.querySelectorAll('td')).map((td) => td.innerText.trim())
+    )
+}));
+const sgpaNodes = document.evaluate("//div[contains(text(), 'SGPA')]", document, null,
+                                    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const sgpa = [];
+for (let i = 0; i < sgpaNodes.snapshotLength; i++) {
+    sgpa.push(sgpaNodes.snapshotItem(i).innerText.trim());
+}
+return Object.assign(header, {tables: tables, sgpa: sgpa});
+"""
+
+@lru_cache(maxsize=1)
+def _get_driver_path() -> str:
+    """Resolve the chromedriver binary once per process"""
+    return ChromeDriverManager().install()
+
+# Returned by _timed_fetch when a roll number should be retried in Selenium
+HANDOFF = object()
+
+_shared_pool: Optional[DriverPool] = None
+_shared_pool_lock = threading.Lock()
+
+def get_driver_pool() -> DriverPool:
+    """Return the process-wide Chrome driver pool, creating it on first use"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = DriverPool(
+                factory=StudentResultScraper(driver_pool=False)._create_driver,
+                max_size=int(os.environ.get('DRIVER_POOL_SIZE', 3)),
+                max_pages=int(os.environ.get('DRIVER_POOL_MAX_PAGES', 50))
+            )
+        return _shared_pool
+
+_shared_cache: Optional[ResultCache] = None
+_shared_flights = SingleFlight()
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache, creating it on first use"""
+    global _shared_cache
+    with _shared_pool_lock:
+        if _shared_cache is None:
+            _shared_cache = ResultCache()
+        return _shared_cache
+
 class StudentResultScraper:
     """Enhanced web scraper for student results"""
     
-    def __init__(self):
+    ENGINES = ('selenium', 'http', 'async')
+    # Healthy p95 seconds per student; a browser round trip is far slower than an API call
+    TARGET_LATENCY = {'selenium': 20.0, 'http': 3.0}
+    
+    def __init__(self, driver_pool: Optional[DriverPool] = None, engine: str = 'selenium',
+                 result_cache: Optional[ResultCache] = None, force_refresh: bool = False,
+                 lean_pages: Optional[bool] = None, series_tracker: Optional[SeriesTracker] = None,
+                 single_flight: Optional[SingleFlight] = None):
         self.website_url = "https://aupulse.campx.in/aupulse/ums/results"
         self.branch_mapping = {
             'b tech in artificial intelligence and machine learning': 'AIML',
@@ -91,9 +241,52 @@ class StudentResultScraper:
             'b tech in mechanical mngineering': 'ME',
             'b tech in civil engineering': 'CE'
         }
+        # Skip images, fonts, stylesheets and trackers the extractor never reads, and load pages
+        # 'eager'ly; off by default until benchmark.py lean-pages has shown the portal still renders
+        self.lean_pages = lean_pages if lean_pages is not None else os.environ.get('LEAN_PAGES', '0') == '1'
         self.chrome_options = self._setup_chrome_options()
         self.max_retries = 3
         self.request_delay = (1, 3)  # Random delay between requests
+        self.retry_delay = 5  # Base seconds before a failed roll number is retried, doubled per attempt
+        # Upper bound for the adaptive controller; the max_threads argument is only where it starts
+        self.max_concurrency = int(os.environ.get('SCRAPE_MAX_THREADS', 8))
+        self.target_latency = float(os.environ['SCRAPE_TARGET_P95']) if os.environ.get('SCRAPE_TARGET_P95') else None
+        self.concurrency: Optional[AdaptiveConcurrency] = None  # Controller of the running queue drain
+        self.browser_limit: Optional[int] = None  # Chrome drivers this job may hold at once, set by the job scheduler
+        # None -> shared process-wide pool, False -> private driver per chunk
+        self._driver_pool = driver_pool
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown scraping engine: {engine}")
+        self.engine = engine
+        self._http_fetcher: Optional[HttpResultFetcher] = None
+        # None -> shared process-wide cache, False -> always hit the portal
+        self._result_cache = result_cache
+        self.force_refresh = force_refresh  # Ignore cached results but still refresh them
+        # Stops probing a range past K consecutive missing students
+        self.series_tracker = series_tracker
+        # None -> shared with every job in this process, False -> never coalesce lookups
+        self.single_flight = (_shared_flights if single_flight is None else single_flight) or None
+        
+    @property
+    def driver_pool(self) -> Optional[DriverPool]:
+        """Pool drivers are borrowed from, or None when pooling is disabled"""
+        if self._driver_pool is None:
+            self._driver_pool = get_driver_pool()
+        return self._driver_pool or None
+    
+    @property
+    def result_cache(self) -> Optional[ResultCache]:
+        """Cache of parsed results, or None when caching is disabled"""
+        if self._result_cache is None:
+            self._result_cache = get_result_cache()
+        return self._result_cache or None
+    
+    @property
+    def http_fetcher(self) -> HttpResultFetcher:
+        """Pooled HTTP client used by the 'http' engine"""
+        if self._http_fetcher is None:
+            self._http_fetcher = HttpResultFetcher()
+        return self._http_fetcher
         
     def _setup_chrome_options(self) -> Options:
         """Configure Chrome options for scraping"""
@@ -112,18 +305,30 @@ class StudentResultScraper:
         # Add user agent to avoid detection
         options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
         
+        if self.lean_pages:
+            # Hand control back once the DOM is ready instead of waiting for every asset
+            options.page_load_strategy = 'eager'
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.managed_default_content_settings.fonts": 2
+            })
+        
         return options
     
     def _create_driver(self) -> webdriver.Chrome:
         """Create and configure Chrome driver"""
         try:
-            driver_path = ChromeDriverManager().install()
-            service = Service(driver_path)
+            service = Service(_get_driver_path())
             driver = webdriver.Chrome(service=service, options=self.chrome_options)
             
             # Execute script to hide automation
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
+            if self.lean_pages:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+            
             return driver
         except Exception as e:
             logger.error(f"Failed to create Chrome driver: {e}")
@@ -136,80 +341,242 @@ class StudentResultScraper:
     
     def scrape_single_student(self, roll_number: str, driver: webdriver.Chrome) -> Optional[StudentResult]:
         """Scrape data for a single student with enhanced error handling"""
-        retries = 0
-        
-        while retries < self.max_retries:
+        for attempt in range(1, self.max_retries + 1):
             try:
-                logger.info(f"Scraping roll number: {roll_number} (Attempt {retries + 1})")
-                
-                # Navigate to the website
-                driver.get(self.website_url)
-                wait = WebDriverWait(driver, 15)
-                
-                # Wait for page to load and find roll number input
-                roll_no_input = wait.until(
-                    EC.presence_of_element_located((By.ID, "rollNo"))
-                )
-                roll_no_input.clear()
-                roll_no_input.send_keys(roll_number)
-                
-                # Select exam type
-                exam_type_dropdown = wait.until(
-                    EC.element_to_be_clickable((By.ID, "examType"))
-                )
-                exam_type_dropdown.click()
-                
-                general_option = wait.until(
-                    EC.element_to_be_clickable((By.XPATH, "//li[@data-value='general']"))
-                )
-                general_option.click()
-                
-                # Click get result button
-                get_result_button = wait.until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[text()='Get Result']"))
-                )
-                get_result_button.click()
-                
-                # Wait for results to load
-                wait.until(
-                    EC.presence_of_element_located(
-                        (By.XPATH, "//*[@id='root']/div[2]/div[2]/div[2]/div/div[2]")
-                    )
-                )
+                result = self._scrape_attempt(roll_number, driver, attempt)
+                if result:
+                    self._random_delay()  # Add delay before next request
+                return result
+            except Exception:
+                if attempt < self.max_retries:
+                    time.sleep(backoff_delay(attempt, self.retry_delay))  # Wait before retry
+        
+        logger.error(f"Failed to scrape roll number {roll_number} after {self.max_retries} attempts")
+        return None
+    
+    def _scrape_attempt(self, roll_number: str, driver: webdriver.Chrome, attempt: int = 1) -> Optional[StudentResult]:
+        """
+        Make one attempt at scraping a student
+        
+        Returns None when the student does not exist and raises on errors
+        worth retrying (timeouts, browser failures)
+        """
+        try:
+            logger.info(f"Scraping roll number: {roll_number} (Attempt {attempt})")
+            
+            student_data = None
+            reused_page = False
+            
+            # Consecutive students in one browser skip the SPA reload
+            if self._on_results_page(driver):
+                try:
+                    student_data = self._lookup_in_place(roll_number, driver)
+                    reused_page = True
+                except ResultNotFound:
+                    raise
+                except Exception as e:
+                    logger.info(f"Could not reuse results page for {roll_number}, reloading: {e.__class__.__name__}")
+            
+            if not reused_page:
+                self._load_and_submit(roll_number, driver)
                 
                 # Extract student information
                 student_data = self._extract_student_data(driver, roll_number)
-                
-                if student_data:
-                    logger.info(f"Successfully scraped data for {roll_number}")
-                    self._random_delay()  # Add delay before next request
-                    return student_data
-                else:
-                    logger.warning(f"No data found for roll number: {roll_number}")
-                    return None
-                    
-            except TimeoutException:
-                logger.warning(f"Timeout occurred for roll number {roll_number}, attempt {retries + 1}")
-                retries += 1
-                if retries < self.max_retries:
-                    time.sleep(5)  # Wait before retry
-                    
-            except NoSuchElementException as e:
-                logger.error(f"Element not found for roll number {roll_number}: {e}")
-                # This might be a valid case where student doesn't exist
+
+            if student_data:
+                logger.info(f"Successfully scraped data for {roll_number}")
+                return student_data
+            else:
+                logger.warning(f"No data found for roll number: {roll_number}")
                 return None
-                
-            except Exception as e:
-                logger.error(f"Unexpected error for roll number {roll_number}: {e}")
-                retries += 1
-                if retries < self.max_retries:
-                    time.sleep(5)
+
+        except ResultNotFound:
+            logger.warning(f"Portal reports no result for roll number: {roll_number}")
+            self._remember_missing(roll_number)
+            return None
+            
+        except TimeoutException:
+            logger.warning(f"Timeout occurred for roll number {roll_number}, attempt {attempt}")
+            raise
+            
+        except NoSuchElementException as e:
+            logger.error(f"Element not found for roll number {roll_number}: {e}")
+            # This might be a valid case where student doesn't exist
+            return None
+            
+        except Exception as e:
+            logger.error(f"Unexpected error for roll number {roll_number}: {e}")
+            raise
+    
+    def _load_and_submit(self, roll_number: str, driver: webdriver.Chrome):
+        """Load the results page from scratch and submit a roll number"""
+        # Navigate to the website
+        driver.get(self.website_url)
+        wait = WebDriverWait(driver, 15)
+
+        # Wait for page to load and find roll number input
+        roll_no_input = wait.until(
+            EC.presence_of_element_located((By.ID, "rollNo"))
+        )
+        roll_no_input.clear()
+        roll_no_input.send_keys(roll_number)
+
+        # Select exam type
+        exam_type_dropdown = wait.until(
+            EC.element_to_be_clickable((By.ID, "examType"))
+        )
+        exam_type_dropdown.click()
+
+        general_option = wait.until(
+            EC.element_to_be_clickable((By.XPATH, "//li[@data-value='general']"))
+        )
+        general_option.click()
+
+        # Click get result button
+        get_result_button = wait.until(
+            EC.element_to_be_clickable((By.XPATH, "//button[text()='Get Result']"))
+        )
+        get_result_button.click()
+
+        # Wait for results to load, or for the portal to say there are none
+        wait.until(EC.any_of(
+            EC.presence_of_element_located((By.XPATH, RESULT_CONTAINER_XPATH)),
+            EC.presence_of_element_located((By.XPATH, NO_RESULT_XPATH))
+        ))
+        if not driver.find_elements(By.XPATH, RESULT_CONTAINER_XPATH):
+            raise ResultNotFound(roll_number)
+    
+    def _on_results_page(self, driver: webdriver.Chrome) -> bool:
+        """Whether the driver still has the results SPA loaded with a previous result"""
+        try:
+            return (driver.current_url.startswith(self.website_url)
+                    and bool(driver.find_elements(By.ID, "rollNo"))
+                    and bool(driver.find_elements(By.XPATH, RESULT_HALL_TICKET_XPATH)))
+        except Exception:
+            return False
+    
+    def _lookup_in_place(self, roll_number: str, driver: webdriver.Chrome) -> StudentResult:
+        """
+        Submit another roll number on the already loaded page
         
-        logger.error(f"Failed to scrape roll number {roll_number} after {self.max_retries} attempts")
-        return None
+        The exam type selection survives between lookups, so only the roll
+        number is replaced. Raises if the page does not switch to the new
+        student, so the caller can fall back to a full reload.
+        """
+        previous = driver.find_element(By.XPATH, RESULT_HALL_TICKET_XPATH)
+        # A toast from an earlier miss may still be showing; only new ones count
+        old_alerts = set(alert.id for alert in driver.find_elements(By.XPATH, NO_RESULT_XPATH))
+        
+        roll_no_input = driver.find_element(By.ID, "rollNo")
+        # React-controlled inputs can ignore clear(), so select and delete instead
+        roll_no_input.send_keys(Keys.CONTROL, 'a')
+        roll_no_input.send_keys(Keys.DELETE)
+        roll_no_input.send_keys(roll_number)
+        driver.find_element(By.XPATH, "//button[text()='Get Result']").click()
+        
+        def new_alert(d):
+            return any(alert.id not in old_alerts for alert in d.find_elements(By.XPATH, NO_RESULT_XPATH))
+        
+        def switched(d):
+            if new_alert(d):
+                return True
+            try:
+                return previous.text.strip().upper() == roll_number.upper()
+            except StaleElementReferenceException:
+                # The previous result was torn down; wait for the new one
+                current = d.find_elements(By.XPATH, RESULT_HALL_TICKET_XPATH)
+                return bool(current) and current[0].text.strip().upper() == roll_number.upper()
+        
+        WebDriverWait(driver, 10).until(switched)
+        if new_alert(driver):
+            raise ResultNotFound(roll_number)
+        
+        student_data = self._extract_student_data(driver, roll_number)
+        if student_data is None or student_data.hall_ticket_number.upper() != roll_number.upper():
+            raise ValueError("results page still shows a different student")
+        return student_data
+    
+    def scrape_single_student_http(self, roll_number: str) -> Optional[StudentResult]:
+        """
+        Fetch a single student through the results API without a browser
+        
+        Returns None when the portal has no result for the roll number and
+        raises on transport or payload errors so callers can fall back to Selenium
+        """
+        try:
+            raw = self.http_fetcher.fetch_raw(roll_number)
+        except ResultNotFound:
+            logger.warning(f"No data found for roll number: {roll_number}")
+            self._remember_missing(roll_number)
+            return None
+        
+        return self._result_from_raw(raw)
+    
+    def _remember_missing(self, roll_number: str):
+        """
+        Add a roll number the portal has no result for to the negative cache
+        
+        Every engine reads the cache, so only misses the portal itself
+        reported (its no-result alert or message) may be recorded; a failed
+        API fetch must still reach the browser.
+        """
+        cache = self.result_cache
+        if cache is None:
+            return
+        try:
+            cache.put_missing(roll_number)
+        except Exception as e:
+            logger.warning(f"Could not cache missing roll number {roll_number}: {e}")
+    
+    def _result_from_raw(self, raw: Dict[str, Any]) -> StudentResult:
+        """Build a StudentResult from a payload normalized by HttpResultFetcher"""
+        return self._build_student_result(
+            raw['hall_ticket_number'], raw['student_name'], raw['program'],
+            raw['cgpa'], raw['semesters'], raw['sgpa']
+        )
     
     def _extract_student_data(self, driver: webdriver.Chrome, roll_number: str) -> Optional[StudentResult]:
-        """Extract student data from the results page"""
+        """Extract student data from the results page in a single browser round trip"""
+        try:
+            # The semester tables render after the header block
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CLASS_NAME, 'css-1n196hx'))
+            )
+        except TimeoutException:
+            logger.warning("Semester tables not found or timeout occurred.")
+        
+        try:
+            snapshot = driver.execute_script(RESULT_SNAPSHOT_SCRIPT)
+        except Exception as e:
+            logger.warning(f"Result page snapshot failed for {roll_number}: {e}")
+            snapshot = None
+        
+        if not snapshot:
+            return self._extract_student_data_elements(driver, roll_number)
+        
+        try:
+            semesters = [self._parse_snapshot_table(table) for table in snapshot['tables']]
+            return self._build_student_result(
+                snapshot['hallTicketNumber'], snapshot['studentName'], snapshot['program'],
+                snapshot['cgpa'], semesters, snapshot['sgpa']
+            )
+        except Exception as e:
+            logger.error(f"Error extracting student data for {roll_number}: {e}")
+            return None
+    
+    def _parse_snapshot_table(self, table: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Turn one snapshotted table into course rows keyed by header"""
+        headers = table['headers']
+        semester_data = []
+        for cells in table['rows'][1:]:  # Skip header row
+            if len(cells) >= len(headers):
+                row_data = {header: cells[i] for i, header in enumerate(headers)}
+                row_data["Status"] = row_data.get("Status", "")
+                semester_data.append(row_data)
+        return semester_data
+    
+    def _extract_student_data_elements(self, driver: webdriver.Chrome, roll_number: str) -> Optional[StudentResult]:
+        """Extract student data element by element (fallback when the snapshot script fails)"""
         try:
             # Extract basic information
             student_name = driver.find_element(
@@ -224,72 +591,69 @@ class StudentResultScraper:
                 By.XPATH, "//*[@id='root']/div[2]/div[2]/div[2]/div/div[2]/div[1]/div[3]/p"
             ).text.strip()
             
-            
-            # Determine program and branch
-            program = "B Tech" if "B TECH" in program_element else "Unknown"
-            branch = self.branch_mapping.get(program_element.lower(), "Unknown")
-            section = hall_ticket_number[-3] if len(hall_ticket_number) >= 3 else "Unknown"
-            
             # Extract CGPA
             cgpa_element = driver.find_element(
                 By.XPATH, "//*[@id='root']/div[2]/div[2]/div[2]/div/div[2]/div[2]"
             ).text.strip()
-            cgpa = cgpa_element.split(":")[1].strip() if ":" in cgpa_element else cgpa_element.strip()
             
             # Extract semester tables
-            sem1_details, sem2_details, sem3_details,sem4_details = self._extract_semester_tables(driver)
-            
-            # Calculate backlog count
-            backlog_count = self._calculate_backlogs(sem1_details, sem2_details, sem3_details,sem4_details)
-            
-            # Create semester details and SGPA dictionaries for dynamic storage
-            semester_details = {
-                'sem1': sem1_details,
-                'sem2': sem2_details,
-                'sem3': sem3_details,
-                'sem4': sem4_details
-            }
+            semesters = list(self._extract_semester_tables(driver))
             
             # Extract SGPA values from the page
-            import re
-
-            semester_sgpa = {}
+            sgpa_texts = []
             try:
                 # Find all divs that mention SGPA
                 sgpa_elements = driver.find_elements(By.XPATH, "//div[contains(text(), 'SGPA')]")
-
-                for i, element in enumerate(sgpa_elements):
-                    text = element.text.strip()
-                    match = re.search(r'(\d+\.\d+)', text)  # extract floating number like 7.43
-                    if match:
-                        semester_sgpa[f'sem{i+1}'] = match.group(1)
-                    else:
-                        semester_sgpa[f'sem{i+1}'] = 'N/A'
-
-                # Optional: pad missing semesters up to sem8 as 'N/A'
-                for j in range(len(semester_sgpa) + 1, 9):
-                    semester_sgpa[f'sem{j}'] = 'N/A'
-
+                sgpa_texts = [element.text.strip() for element in sgpa_elements]
             except Exception as e:
                 logger.warning(f"Could not extract SGPA values: {e}")
-                semester_sgpa = {f'sem{i+1}': 'N/A' for i in range(8)}
-
-
-            return StudentResult(
-                hall_ticket_number=hall_ticket_number,
-                student_name=student_name,
-                program=program,
-                branch=branch,
-                section=section,
-                cgpa=cgpa,
-                semester_details=semester_details,
-                semester_sgpa=semester_sgpa,
-                backlog_count=backlog_count
+            
+            return self._build_student_result(
+                hall_ticket_number, student_name, program_element, cgpa_element, semesters, sgpa_texts
             )
                 
         except Exception as e:
             logger.error(f"Error extracting student data for {roll_number}: {e}")
             return None
+    
+    def _build_student_result(self, hall_ticket_number: str, student_name: str, program_text: str,
+                              cgpa_text: str, semesters: List[List[Dict[str, Any]]],
+                              sgpa_texts: List[str]) -> StudentResult:
+        """Build a StudentResult from raw page/API fields, shared by every fetch engine"""
+        # Determine program and branch
+        program = "B Tech" if "B TECH" in program_text.upper() else "Unknown"
+        branch = self.branch_mapping.get(program_text.lower(), "Unknown")
+        section = hall_ticket_number[-3] if len(hall_ticket_number) >= 3 else "Unknown"
+        
+        cgpa = cgpa_text.split(":")[1].strip() if ":" in cgpa_text else cgpa_text.strip()
+        
+        # Pad to the four semesters the export and analysis expect
+        semesters = list(semesters) + [[] for _ in range(4 - len(semesters))]
+        semester_details = {f'sem{i+1}': courses for i, courses in enumerate(semesters)}
+        
+        # Calculate backlog count
+        backlog_count = self._calculate_backlogs(*semesters)
+        
+        semester_sgpa = {}
+        for i, text in enumerate(sgpa_texts):
+            match = re.search(r'(\d+\.\d+)', str(text))  # extract floating number like 7.43
+            semester_sgpa[f'sem{i+1}'] = match.group(1) if match else 'N/A'
+        
+        # Pad missing semesters up to sem8 as 'N/A'
+        for j in range(len(semester_sgpa) + 1, 9):
+            semester_sgpa[f'sem{j}'] = 'N/A'
+        
+        return StudentResult(
+            hall_ticket_number=hall_ticket_number,
+            student_name=student_name,
+            program=program,
+            branch=branch,
+            section=section,
+            cgpa=cgpa,
+            semester_details=semester_details,
+            semester_sgpa=semester_sgpa,
+            backlog_count=backlog_count
+        )
 
     def _extract_semester_tables(self, driver: webdriver.Chrome) -> tuple:
         """Extract semester table data"""
@@ -365,12 +729,11 @@ class StudentResultScraper:
             
         return sem1_details, sem2_details, sem3_details, sem4_details
     
-    def _calculate_backlogs(self, sem1_details: List[Dict], sem2_details: List[Dict], sem3_details: List[Dict],sem4_details: List[Dict]) -> int:
+    def _calculate_backlogs(self, *semesters: List[Dict]) -> int:
         """Calculate total number of backlogs"""
         backlog_count = 0
-        all_semesters = [sem1_details, sem2_details, sem3_details, sem4_details]
         
-        for semester in all_semesters:
+        for semester in semesters:
             for course in semester:
                 status = course.get("Status", "").upper()
                 grade = course.get("Grade", "").upper()
@@ -381,67 +744,415 @@ class StudentResultScraper:
         
         return backlog_count
     
-    def scrape_parallel(self, roll_numbers: List[str], max_threads: int = 3, progress_callback: Optional[Callable] = None) -> List[StudentResult]:
-        """Scrape multiple students in parallel with progress tracking"""
+    def scrape_parallel(self, roll_numbers: List[str], max_threads: int = 3, progress_callback: Optional[Callable] = None,
+                        result_callback: Optional[Callable] = None, roll_callback: Optional[Callable] = None) -> List[StudentResult]:
+        """
+        Scrape multiple students in parallel with progress tracking
+        
+        When result_callback is given, each StudentResult is handed to it as
+        soon as it is parsed instead of being collected in the returned list.
+        roll_callback is called with every roll number once it is finished,
+        whether or not a result was found.
+        """
         results = []
         completed = 0
+        scraped = 0
         total = len(roll_numbers)
+        lock = threading.Lock()
         
-        logger.info(f"Starting parallel scraping for {total} roll numbers with {max_threads} threads")
-        
-        # Split roll numbers into chunks for each thread
-        chunk_size = max(1, len(roll_numbers) // max_threads)
-        chunks = [roll_numbers[i:i + chunk_size] for i in range(0, len(roll_numbers), chunk_size)]
+        def emit(result: StudentResult):
+            nonlocal scraped
+            with lock:
+                scraped += 1
+                if result_callback is None:
+                    results.append(result)
+            if result_callback:
+                result_callback(result)
         
-        with ThreadPoolExecutor(max_workers=max_threads) as executor:
-            # Submit tasks
-            future_to_chunk = {}
-            for chunk in chunks:
-                future = executor.submit(self._scrape_chunk, chunk)
-                future_to_chunk[future] = chunk
+        def on_done(roll_number: str, result: Optional[StudentResult]):
+            nonlocal completed
+            if result:
+                emit(result)
+            if roll_callback:
+                roll_callback(roll_number)
             
-            # Process completed tasks
-            for future in as_completed(future_to_chunk):
-                chunk_results = future.result()
-                results.extend(chunk_results)
-                completed += len(future_to_chunk[future])
-                
-                # Call progress callback if provided
+            with lock:
+                completed += 1
+                done = completed
+                # Report under the lock so counts never go backwards
                 if progress_callback:
-                    progress_callback(completed, total)
-                
-                logger.info(f"Progress: {completed}/{total} completed")
+                    progress_callback(done, total)
+            
+            logger.info(f"Progress: {done}/{total} completed")
+        
+        # Serve fresh cached students without touching the portal
+        cache = self.result_cache
+        if cache is not None and not self.force_refresh:
+            roll_numbers = self._serve_from_cache(cache, roll_numbers, on_done)
+        
+        def on_scraped(roll_number: str, result: Optional[StudentResult]):
+            if result and cache is not None:
+                try:
+                    cache.put(roll_number, asdict(result))
+                except Exception as e:
+                    logger.warning(f"Could not cache result for {roll_number}: {e}")
+            on_done(roll_number, result)
+        
+        if self.engine == 'async':
+            self._scrape_async(roll_numbers, on_scraped)
+            logger.info(f"Scraping completed. Successfully scraped {scraped} out of {total} roll numbers")
+            return results
+        
+        logger.info(f"Starting parallel scraping for {total} roll numbers with {max_threads} threads")
+        
+        fallback = self._drain_queue(roll_numbers, max_threads, on_scraped, self.engine)
+        if fallback:
+            logger.warning(f"Falling back to Selenium for {len(fallback)} roll numbers")
+            self._drain_queue(fallback, max_threads, on_scraped, 'selenium')
         
-        logger.info(f"Scraping completed. Successfully scraped {len(results)} out of {total} roll numbers")
+        logger.info(f"Scraping completed. Successfully scraped {scraped} out of {total} roll numbers")
         return results
     
-    def _scrape_chunk(self, roll_numbers: List[str]) -> List[StudentResult]:
-        """Scrape a chunk of roll numbers in a single thread"""
-        results = []
+    def _serve_from_cache(self, cache: ResultCache, roll_numbers: List[str], on_done: Callable) -> List[str]:
+        """
+        Complete cached roll numbers immediately and return the ones still to scrape
+        
+        Roll numbers recently confirmed to have no result are completed as
+        missing too, without a portal lookup.
+        """
+        try:
+            cached = cache.get_many(roll_numbers)
+            missing = cache.get_missing([roll_number for roll_number in roll_numbers if roll_number not in cached])
+        except Exception as e:
+            logger.warning(f"Result cache unavailable: {e}")
+            return roll_numbers
+        
+        if cached:
+            logger.info(f"Serving {len(cached)} of {len(roll_numbers)} roll numbers from cache")
+        if missing:
+            logger.info(f"Skipping {len(missing)} roll numbers known to have no result")
+        
+        misses = []
+        for roll_number in roll_numbers:
+            record = cached.get(roll_number)
+            if record is not None:
+                on_done(roll_number, StudentResult(**record))
+            elif roll_number in missing:
+                if self.series_tracker:
+                    self.series_tracker.record(roll_number, False)
+                on_done(roll_number, None)
+            else:
+                misses.append(roll_number)
+        return misses
+    
+    def scrape_stream(self, roll_numbers: List[str], max_threads: int = 3, progress_callback: Optional[Callable] = None,
+                      roll_callback: Optional[Callable] = None) -> Iterator[StudentResult]:
+        """
+        Yield each student as soon as it is scraped, without holding the whole batch in memory
+        
+        roll_callback runs on the consuming thread, once the caller has
+        handled the student (if any) yielded for that roll number, so a roll
+        number is never reported finished before its student has been saved.
+        """
+        stream = queue.Queue()
+        finished = object()
+        roll_done = object()
+        errors = []
+        
+        def run():
+            try:
+                self.scrape_parallel(roll_numbers, max_threads, progress_callback, result_callback=stream.put,
+                                     roll_callback=lambda roll_number: stream.put((roll_done, roll_number)))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                stream.put(finished)
+        
+        threading.Thread(target=run, daemon=True).start()
+        while True:
+            item = stream.get()
+            if item is finished:
+                break
+            if isinstance(item, tuple) and item[0] is roll_done:
+                # Queued behind the roll number's student, so that has been consumed by now
+                if roll_callback:
+                    roll_callback(item[1])
+                continue
+            yield item
+        
+        if errors:
+            raise errors[0]
+    
+    def _scrape_async(self, roll_numbers: List[str], on_done: Callable):
+        """Fetch every roll number concurrently on an event loop, then retry failures in Selenium"""
+        logger.info(f"Starting async scraping for {len(roll_numbers)} roll numbers")
+        
+        engine = AsyncResultEngine(fetcher=self.http_fetcher, max_retries=self.max_retries)
+        tracker = self.series_tracker
+        flights = self.single_flight
+        skipped, led, followed, finished = set(), set(), set(), set()
+        shared = queue.Queue()  # (roll number, outcome) of lookups other jobs were already making
+        
+        def skip(roll_number: str) -> bool:
+            # Checked again before every retry; a roll number this job leads stays ours
+            if roll_number in led:
+                return False
+            if tracker and tracker.should_skip(roll_number):
+                skipped.add(roll_number)
+                return True
+            if flights and not flights.claim(roll_number, partial(lambda r, outcome: shared.put((r, outcome)),
+                                                                    roll_number)):
+                followed.add(roll_number)
+                return True
+            led.add(roll_number)
+            return False
+        
+        def on_raw(roll_number: str, raw: Optional[Dict[str, Any]]):
+            if roll_number in followed:
+                return  # Settled when the other job's lookup finishes
+            result = self._result_from_raw(raw) if raw else None
+            if roll_number in led and flights:
+                flights.finish(roll_number, result)
+                finished.add(roll_number)
+            # The engine settles skipped roll numbers like missing ones; only real misses are remembered
+            if roll_number not in skipped:
+                if tracker:
+                    tracker.record(roll_number, raw is not None)
+                if raw is None:
+                    self._remember_missing(roll_number)
+            on_done(roll_number, result)
+        
+        try:
+            _, failed = engine.run(roll_numbers, result_callback=on_raw,
+                                   skip=skip if tracker or flights else None)
+        finally:
+            # Lookups that failed, or were cut short by the engine raising, would otherwise
+            # leave other jobs following them waiting forever
+            if flights:
+                for roll_number in led - finished:
+                    flights.finish(roll_number, FAILED)
+        
+        if flights:
+            for _ in followed:
+                roll_number, outcome = shared.get()
+                if outcome is FAILED:
+                    failed.append(roll_number)
+                    continue
+                if tracker:
+                    tracker.record(roll_number, outcome is not None)
+                on_done(roll_number, outcome)
+        
+        if failed:
+            logger.warning(f"Falling back to Selenium for {len(failed)} roll numbers")
+            self._drain_queue(failed, 3, on_done, 'selenium')
+    
+    def _drain_queue(self, roll_numbers: List[str], max_threads: int, on_done: Callable, engine: str) -> List[str]:
+        """
+        Process roll numbers from a shared work queue
+        
+        Workers pull one roll number at a time, so a run of slow or failing
+        students only delays the worker holding them. Failed attempts are
+        re-enqueued at the back until max_retries is reached.
+        
+        Returns:
+            Roll numbers the HTTP engine could not fetch and handed off for Selenium
+        """
+        if not roll_numbers:
+            return []
+        
+        # Threads are started up to the controller's ceiling; it decides how many run at once.
+        # No point running more of them than there are pooled drivers.
+        maximum = max(max_threads, self.max_concurrency)
+        if engine == 'selenium' and self.driver_pool is not None:
+            maximum = min(maximum, self.driver_pool.max_size)
+        if engine == 'selenium' and self.browser_limit:
+            maximum = min(maximum, self.browser_limit)
+        workers = max(1, min(maximum, len(roll_numbers)))
+        self.concurrency = AdaptiveConcurrency(
+            initial=min(max_threads, workers),
+            maximum=workers,
+            target_latency=self.target_latency or self.TARGET_LATENCY[engine]
+        )
+        
+        work = queue.Queue()
+        for roll_number in roll_numbers:
+            work.put((roll_number, 1, 0.0))
+        
+        state = {'live_workers': workers, 'handoff': []}
+        state_lock = threading.Lock()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._queue_worker, work, on_done, engine, state, state_lock)
+                for _ in range(workers)
+            ]
+            work.join()
+            for _ in futures:
+                work.put(None)
+            for future in futures:
+                future.result()
+        
+        return state['handoff']
+    
+    def _queue_worker(self, work: queue.Queue, on_done: Callable, engine: str, state: Dict[str, Any], state_lock: threading.Lock):
+        """Pull roll numbers until the queue is closed with a sentinel"""
+        pool = self.driver_pool if engine == 'selenium' else None
+        controller = self.concurrency
         driver = None
         
         try:
-            driver = self._create_driver()
-            
-            for roll_number in roll_numbers:
+            while True:
+                if engine == 'selenium' and driver is None:
+                    try:
+                        driver = pool.acquire() if pool else self._create_driver()
+                    except Exception as e:
+                        logger.error(f"Worker could not start a Chrome driver: {e}")
+                        self._retire_worker(work, on_done, state, state_lock)
+                        return
+                
+                item = work.get()
+                if item is None:
+                    work.task_done()
+                    return
+                
+                roll_number, attempt, not_before = item
+                settled_later = False
                 try:
-                    result = self.scrape_single_student(roll_number, driver)
-                    if result:
-                        results.append(result)
-                except Exception as e:
-                    logger.error(f"Error scraping {roll_number} in chunk: {e}")
-                    continue
+                    # Retries sit at the back of the queue; only wait if nothing else was ahead
+                    delay = not_before - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
                     
-        except Exception as e:
-            logger.error(f"Error in chunk processing: {e}")
+                    if self.series_tracker and self.series_tracker.should_skip(roll_number):
+                        on_done(roll_number, None)
+                        continue
+                    
+                    # Another job is fetching this student already; its outcome settles the task
+                    flights = self.single_flight
+                    if flights and not flights.claim(roll_number, partial(
+                            self._on_shared_result, work, on_done, state, state_lock, roll_number, attempt)):
+                        settled_later = True
+                        continue
+                    
+                    outcome = FAILED
+                    try:
+                        result = self._timed_fetch(controller, roll_number, driver, pool, engine, attempt)
+                        if result is not HANDOFF:
+                            outcome = result
+                    finally:
+                        if flights:
+                            flights.finish(roll_number, outcome)
+                    if result is HANDOFF:
+                        state['handoff'].append(roll_number)
+                        continue
+                    if self.series_tracker:
+                        self.series_tracker.record(roll_number, result is not None)
+                    on_done(roll_number, result)
+                    if result and engine == 'selenium':
+                        self._random_delay()  # Add delay before next request
+                    
+                except Exception:
+                    if attempt < self.max_retries:
+                        work.put((roll_number, attempt + 1, time.time() + backoff_delay(attempt, self.retry_delay)))
+                    else:
+                        logger.error(f"Failed to scrape roll number {roll_number} after {self.max_retries} attempts")
+                        on_done(roll_number, None)
+                    
+                    if driver is not None and not self._driver_alive(driver):
+                        logger.warning("Chrome driver stopped responding, replacing it")
+                        self._close_driver(driver, pool, discard=True)
+                        driver = None
+                finally:
+                    if not settled_later:
+                        work.task_done()
+        finally:
+            if driver is not None:
+                self._close_driver(driver, pool)
+    
+    def _on_shared_result(self, work: queue.Queue, on_done: Callable, state: Dict[str, Any], state_lock: threading.Lock,
+                          roll_number: str, attempt: int, outcome: Any):
+        """Settle a queued roll number with the outcome of another job's fetch"""
+        try:
+            if outcome is FAILED:
+                # The other job gave up on it; fetch it ourselves, unless every worker has retired
+                # and nothing would ever take it off the queue
+                with state_lock:
+                    if state['live_workers'] > 0:
+                        work.put((roll_number, attempt, 0.0))
+                        return
+                logger.error(f"Failed to scrape roll number {roll_number}: no worker left to retry it")
+                on_done(roll_number, None)
+                return
+            if self.series_tracker:
+                self.series_tracker.record(roll_number, outcome is not None)
+            on_done(roll_number, outcome)
         finally:
-            if driver:
+            work.task_done()
+    
+    def _timed_fetch(self, controller: AdaptiveConcurrency, roll_number: str, driver: Optional[webdriver.Chrome],
+                     pool: Optional[DriverPool], engine: str, attempt: int):
+        """
+        Fetch one student inside a concurrency slot, reporting its latency to the controller
+        
+        Returns HANDOFF when the HTTP engine failed and the roll number should go to Selenium
+        """
+        controller.acquire()
+        start = time.perf_counter()
+        try:
+            if engine == 'http':
                 try:
-                    driver.quit()
+                    result = self.scrape_single_student_http(roll_number)
                 except Exception as e:
-                    logger.error(f"Error closing driver: {e}")
+                    controller.record(time.perf_counter() - start, timed_out=isinstance(e, RequestTimeout))
+                    logger.warning(f"HTTP fetch failed for {roll_number}, falling back to Selenium: {e}")
+                    return HANDOFF
+            else:
+                try:
+                    result = self._scrape_attempt(roll_number, driver, attempt)
+                except TimeoutException:
+                    controller.record(time.perf_counter() - start, timed_out=True)
+                    raise
+                finally:
+                    if pool:
+                        pool.record_page(driver)
+            controller.record(time.perf_counter() - start)
+            return result
+        finally:
+            controller.release()
+    
+    def _retire_worker(self, work: queue.Queue, on_done: Callable, state: Dict[str, Any], state_lock: threading.Lock):
+        """Drop a worker that lost its driver; the last one out fails whatever is still queued"""
+        with state_lock:
+            state['live_workers'] -= 1
+            if state['live_workers'] > 0:
+                return
         
-        return results
+        while True:
+            try:
+                item = work.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                on_done(item[0], None)
+            work.task_done()
+    
+    def _driver_alive(self, driver: webdriver.Chrome) -> bool:
+        """Check whether a browser session still responds"""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def _close_driver(self, driver: webdriver.Chrome, pool: Optional[DriverPool], discard: bool = False):
+        """Return a driver to the pool, or quit it when it is not pooled"""
+        if pool:
+            pool.release(driver, discard=discard)
+            return
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error(f"Error closing driver: {e}")
     
     def save_to_excel(self, results: List[StudentResult], filename: str, selected_columns: List[str] = None):
         """Save results to Excel with enhanced formatting"""
@@ -451,44 +1162,7 @@ class StudentResultScraper:
 
         logger.info(f"Saving {len(results)} results to {filename}")
 
-        all_rows = []
-
-        for student in results:
-            student_row = {
-                ("Hall Ticket Number", ""): student.hall_ticket_number,
-                ("Student Name", ""): student.student_name,
-                ("Program", ""): student.program,
-                ("Branch", ""): student.branch,
-                ("Section", ""): student.section,
-                ("CGPA", ""): student.cgpa,
-                ("No of Backlogs", ""): student.backlog_count
-            }
-
-            # Add semester details
-            for sem_name, sem_data in [
-                ("Sem1 Details", student.sem1_details),
-                ("Sem2 Details", student.sem2_details),
-                ("Sem3 Details", student.sem3_details),
-                ("Sem4 Details", student.sem4_details)
-            ]:
-                if sem_name in selected_columns or selected_columns is None:
-                    for course in sem_data:
-                        course_name = course.get("Course Name", "Unknown Course")
-                        student_row[(course_name, "Grade")] = course.get("Grade", "")
-                        student_row[(course_name, "Status")] = course.get("Status", "")
-                        student_row[(course_name, "Credits")] = course.get("Credits", "")
-
-            # Add SGPA values if semN SGPA is selected
-            if selected_columns is None or "Sem1 Details" in selected_columns:
-                student_row[("Sem1 SGPA", "")] = student.sem1_sgpa
-            if selected_columns is None or "Sem2 Details" in selected_columns:
-                student_row[("Sem2 SGPA", "")] = student.sem2_sgpa
-            if selected_columns is None or "Sem3 Details" in selected_columns:
-                student_row[("Sem3 SGPA", "")] = student.sem3_sgpa
-            if selected_columns is None or "Sem4 Details" in selected_columns:
-                student_row[("Sem4 SGPA", "")] = student.sem4_sgpa
-
-            all_rows.append(student_row)
+        all_rows = [build_excel_row(student, selected_columns) for student in results]
 
         # Create DataFrame
         if all_rows:
@@ -504,7 +1178,7 @@ class StudentResultScraper:
             #  Sort by last 2 digits of roll number
             df = df.sort_values(
                 by=("Hall Ticket Number", ""),
-                key=lambda col: col.astype(str).str[-2:].astype(int)
+                key=lambda col: col.map(roll_sort_key)
             )
             df.index = range(1, len(df) + 1)
 
@@ -0,0 +1,143 @@
+"""
+Fast loading of uploaded result workbooks: the header layout (the export's
+two header rows, or a plain single header) is sniffed from the first rows,
+then the sheet is read exactly once, streamed through openpyxl's read-only
+reader or, when python-calamine is installed, parsed by calamine
+"""
+
+import importlib.util
+import logging
+import os
+from dataclasses import dataclass
+from itertools import chain, islice
+from typing import Iterator, List, Optional, Sequence
+
+import openpyxl
+import pandas as pd
+
+from column_schema import infer_schema
+
+logger = logging.getLogger(__name__)
+
+# calamine parses .xlsx several times faster than openpyxl; EXCEL_ENGINE overrides the choice
+EXCEL_ENGINE = os.environ.get('EXCEL_ENGINE') or (
+    'calamine' if importlib.util.find_spec('python_calamine') else 'openpyxl')
+
+# Rows examined to work out the header layout
+SNIFF_ROWS = 5
+
+# Second-row labels that mark the export's two-row (field, detail) header
+DETAIL_LABELS = {'grade', 'status', 'credits', 'detail'}
+
+
+@dataclass
+class HeaderLayout:
+    """Where a sheet's data starts and what its columns are called"""
+    columns: List[str]
+    data_start: int
+
+
+def _blank(value) -> bool:
+    return value is None or (isinstance(value, float) and pd.isna(value)) or str(value).strip() == ''
+
+
+def _unique(names: List[str]) -> List[str]:
+    """Suffix repeated headers (e.g. a course taken twice) with .1, .2, ... as pandas does"""
+    seen = {}
+    unique = []
+    for name in names:
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        unique.append(f"{name}.{count}" if count else name)
+    return unique
+
+
+def sniff_header(rows: Sequence[Sequence]) -> HeaderLayout:
+    """
+    Work out the header layout from a sheet's first rows
+
+    Exports from save_to_excel/export_checkpoint have a field row, a detail
+    row (Grade/Status/Credits under each course, whose name is merged across
+    them) and a blank index-name row; they are flattened to '<course>_Grade'
+    style names. Anything else is taken to have a single header row.
+    """
+    first = list(rows[0]) if rows else []
+    second = list(rows[1]) if len(rows) > 1 else []
+    if not any(not _blank(value) and str(value).strip().lower() in DETAIL_LABELS for value in second):
+        columns = [f"Unnamed: {i}" if _blank(value) else str(value).strip() for i, value in enumerate(first)]
+        return HeaderLayout(_unique(columns), 1)
+
+    columns = []
+    field = ''
+    for i in range(max(len(first), len(second))):
+        if i < len(first) and not _blank(first[i]):
+            field = str(first[i]).strip()
+        detail = second[i] if i < len(second) else None
+        columns.append(f"{field}_{str(detail).strip()}" if not _blank(detail) else field or f"Unnamed: {i}")
+
+    data_start = 2
+    if len(rows) > 2 and all(_blank(value) for value in rows[2]):
+        data_start = 3
+    return HeaderLayout(_unique(columns), data_start)
+
+
+def _stream_rows(file_path: str) -> Iterator[Sequence]:
+    """Rows of the first sheet as plain values, streamed by openpyxl's read-only reader"""
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _apply_dtype_hints(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep identity and grade text as strings and make GPA, backlog and credit columns numeric"""
+    schema = infer_schema(tuple(df.columns))
+    text_cols = list(schema.identity.values())
+    numeric_cols = schema.gpa_cols + ([schema.backlogs] if schema.backlogs else [])
+    for details in schema.courses.values():
+        text_cols += [details[key] for key in ('grade', 'status') if key in details]
+        if 'credits' in details:
+            numeric_cols.append(details['credits'])
+
+    for col in text_cols:
+        values = df[col]
+        df[col] = values.where(values.isna(), values.astype(str))
+    for col in numeric_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def load_workbook(file_path: str, engine: Optional[str] = None) -> pd.DataFrame:
+    """
+    Load the first sheet of an .xlsx/.xls workbook with flattened column names
+
+    Args:
+        engine: 'openpyxl' or 'calamine', defaulting to EXCEL_ENGINE; .xls
+            files, which openpyxl can't read, fall back to pandas' default
+    """
+    engine = engine or EXCEL_ENGINE
+    if engine == 'openpyxl' and os.path.splitext(file_path)[1].lower() == '.xls':
+        engine = None
+
+    if engine == 'openpyxl':
+        rows = _stream_rows(file_path)
+        head = list(islice(rows, SNIFF_ROWS))
+        if not head:
+            return pd.DataFrame()
+        layout = sniff_header(head)
+        width = len(layout.columns)
+        data = [row[:width] for row in chain(head[layout.data_start:], rows)]
+        df = pd.DataFrame(data, columns=layout.columns[:max((len(row) for row in data), default=width)])
+    else:
+        raw = pd.read_excel(file_path, header=None, dtype=object, engine=engine)
+        if raw.empty:
+            return pd.DataFrame()
+        layout = sniff_header(raw.head(SNIFF_ROWS).to_numpy().tolist())
+        df = raw.iloc[layout.data_start:, :len(layout.columns)].reset_index(drop=True)
+        df.columns = layout.columns[:len(df.columns)]
+        df = df.infer_objects()
+
+    logger.debug(f"Read {len(df)} rows x {len(df.columns)} columns with {engine or 'default'} engine, "
+                 f"data from row {layout.data_start + 1}")
+    return _apply_dtype_hints(df)
@@ -0,0 +1,58 @@
+"""
+Single-flight coalescing of student lookups: while one job is fetching a
+roll number, other jobs asking for it wait for that fetch instead of
+sending the portal a duplicate request
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Outcome handed to followers when the leader's fetch failed; they fetch it themselves
+FAILED = object()
+
+
+class SingleFlight:
+    """Process-wide registry of roll numbers currently being fetched"""
+
+    def __init__(self):
+        self._followers: Dict[str, List[Callable[[Any], None]]] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def claim(self, roll_number: str, on_result: Callable[[Any], None]) -> bool:
+        """
+        Become the fetcher of a roll number, or follow the one already fetching it
+
+        Returns:
+            True if the caller must fetch the roll number and then call
+            finish(); False if on_result will instead be called with the
+            fetching job's outcome: a result, None when the student has no
+            result, or FAILED
+        """
+        key = roll_number.strip().upper()
+        with self._lock:
+            followers = self._followers.get(key)
+            if followers is None:
+                self._followers[key] = []
+                return True
+            followers.append(on_result)
+            self.coalesced += 1
+        logger.debug(f"{roll_number} is already being fetched, waiting for that result")
+        return False
+
+    def finish(self, roll_number: str, outcome: Any):
+        """Release a claimed roll number, handing its outcome to every follower"""
+        with self._lock:
+            followers = self._followers.pop(roll_number.strip().upper(), [])
+        for on_result in followers:
+            try:
+                on_result(outcome)
+            except Exception as e:
+                logger.error(f"Error delivering shared result for {roll_number}: {e}")
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._followers)
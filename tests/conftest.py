@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from replay_server import ReplayServer  # noqa: E402
+
+
+@pytest.fixture
+def portal():
+    """Replay server standing in for the portal's results API"""
+    with ReplayServer() as server:
+        yield server
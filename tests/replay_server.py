@@ -0,0 +1,68 @@
+"""
+Local stand-in for the portal's results API that replays recorded responses
+
+Each fixture in fixtures/portal is named after a roll number and holds the
+status and JSON body the portal answered with. Roll numbers without a
+fixture get a bare HTML 404, like a proxy in front of the API would send.
+"""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'portal')
+
+
+def load_recordings(fixture_dir: str = FIXTURE_DIR) -> Dict[str, Dict]:
+    """Recorded responses keyed by roll number"""
+    recordings = {}
+    for name in os.listdir(fixture_dir):
+        if name.endswith('.json'):
+            with open(os.path.join(fixture_dir, name)) as f:
+                recordings[name[:-len('.json')]] = json.load(f)
+    return recordings
+
+
+class ReplayServer:
+    """Serve recorded portal responses on a free local port"""
+
+    def __init__(self, recordings: Dict[str, Dict] = None):
+        self.recordings = load_recordings() if recordings is None else recordings
+        self.requests: List[str] = []  # Roll numbers asked for, in order
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                roll_number = parse_qs(urlparse(self.path).query).get('rollNo', [''])[0]
+                server.requests.append(roll_number)
+                recording = server.recordings.get(roll_number)
+                if recording is None:
+                    self._send(404, b'<html><body><h1>404 Not Found</h1></body></html>', 'text/html')
+                else:
+                    self._send(recording['status'], json.dumps(recording['body']).encode(), 'application/json')
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}/exams/results/student-results"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from column_schema import infer_schema
+from data_analyzer import DataAnalyzer
+
+EXPORT_HEADERS = (
+    'Course/Field_Detail', 'Hall Ticket Number', 'Student Name', 'Program', 'Branch', 'Section', 'CGPA',
+    'No of Backlogs', 'Course 101_Grade', 'Course 101_Status', 'Course 101_Credits',
+    'Course 102_Grade', 'Course 102_Status', 'Course 102_Credits',
+    'Sem1 SGPA', 'Sem2 SGPA', 'Sem3 SGPA', 'Sem4 SGPA',
+)
+
+
+def test_export_headers():
+    schema = infer_schema(EXPORT_HEADERS)
+
+    assert schema.identity == {
+        'roll_number': 'Hall Ticket Number', 'name': 'Student Name', 'program': 'Program',
+        'branch': 'Branch', 'section': 'Section',
+    }
+    assert schema.cgpa == 'CGPA'
+    assert schema.backlogs == 'No of Backlogs'
+    assert schema.sgpa == {1: 'Sem1 SGPA', 2: 'Sem2 SGPA', 3: 'Sem3 SGPA', 4: 'Sem4 SGPA'}
+    assert schema.courses['Course 101'] == {
+        'grade': 'Course 101_Grade', 'status': 'Course 101_Status', 'credits': 'Course 101_Credits',
+    }
+    assert schema.gpa_cols == ['CGPA', 'Sem1 SGPA', 'Sem2 SGPA', 'Sem3 SGPA', 'Sem4 SGPA']
+
+
+@pytest.mark.parametrize('header, semester', [
+    ('Sem1 SGPA', 1),
+    ('SGPA_Sem2', 2),
+    ('Result_Semester 3 SGPA', 3),
+    ('Semester-4 GPA', 4),
+    ('sem_5_sgpa', 5),
+    ('SGPA (SEM 6)', 6),
+])
+def test_semester_gpa_variants(header, semester):
+    schema = infer_schema(('Hall Ticket Number', 'CGPA', header))
+
+    assert schema.sgpa == {semester: header}
+    assert schema.cgpa == 'CGPA'
+
+
+def test_sem_inside_a_word_is_not_a_semester():
+    schema = infer_schema(('Assem2 GPA',))
+
+    assert schema.sgpa == {}
+
+
+def test_performance_trends_follow_underscored_semester_headers():
+    df = pd.DataFrame({
+        'Hall Ticket Number': ['1', '2'], 'CGPA': ['8.0', '6.5'],
+        'SGPA_Sem1': ['8.1', '6.0'], 'SGPA_Sem2': ['7.9', '7.0'],
+    })
+
+    trends = DataAnalyzer().analyze_dataframe(df)['performance_trends']
+
+    assert trends['semesters'] == ['Semester 1', 'Semester 2']
+    assert [float(value) for value in trends['cgpa_trends']] == [7.05, 7.45]
@@ -0,0 +1,98 @@
+import pytest
+import requests
+
+from async_scraper import AsyncResultEngine
+from http_fetcher import HttpResultFetcher, ResultNotFound, reports_no_result
+from scraper import StudentResultScraper
+
+
+@pytest.fixture
+def fetcher(portal):
+    return HttpResultFetcher(api_url=portal.url, timeout=5)
+
+
+def test_fetch_raw_normalizes_nested_payload(fetcher):
+    raw = fetcher.fetch_raw('22B81A0501')
+
+    assert raw['hall_ticket_number'] == '22B81A0501'
+    assert raw['student_name'] == 'ANANYA REDDY'
+    assert raw['sgpa'] == ['SGPA: 8.40', 'SGPA: 7.85']
+    assert raw['semesters'][1][0] == {
+        'Course Code': 'MA102', 'Course Name': 'Engineering Mathematics II',
+        'Credits': '4', 'Grade': 'F', 'Status': 'F',
+    }
+
+
+def test_fetch_raw_accepts_field_aliases(fetcher):
+    raw = fetcher.fetch_raw('22B81A0502')
+
+    assert raw['student_name'] == 'KARTHIK VARMA'
+    assert raw['cgpa'] == '7.40'
+    assert raw['semesters'] == [[{
+        'Course Code': 'MA101', 'Course Name': 'Engineering Mathematics I',
+        'Credits': '4', 'Grade': 'B', 'Status': 'P',
+    }]]
+
+
+def test_explicit_no_result_message_raises_result_not_found(fetcher):
+    with pytest.raises(ResultNotFound):
+        fetcher.fetch_raw('22B81A0599')
+
+
+def test_bare_404_is_a_fetch_failure(fetcher):
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch_raw('22B81A0500')
+
+
+def test_unexpected_payload_is_a_fetch_failure(fetcher):
+    with pytest.raises(ValueError) as excinfo:
+        fetcher.fetch_raw('22B81A0598')
+    assert not isinstance(excinfo.value, ResultNotFound)
+
+
+def test_async_engine_matches_http_engine(fetcher):
+    engine = AsyncResultEngine(fetcher=fetcher, concurrency=4, rate=100, max_retries=1)
+    settled = {}
+
+    _, failed = engine.run(['22B81A0501', '22B81A0502', '22B81A0599', '22B81A0500', '22B81A0598'],
+                           result_callback=settled.__setitem__)
+
+    assert settled['22B81A0501'] == fetcher.fetch_raw('22B81A0501')
+    assert settled['22B81A0502']['student_name'] == 'KARTHIK VARMA'
+    assert settled['22B81A0599'] is None
+    assert sorted(failed) == ['22B81A0500', '22B81A0598']
+
+
+def test_http_engine_builds_student_result(fetcher):
+    scraper = StudentResultScraper(driver_pool=False, engine='http', result_cache=False, single_flight=False)
+    scraper._http_fetcher = fetcher
+
+    student = scraper.scrape_single_student_http('22B81A0501')
+
+    assert student.branch == 'CSE'
+    assert student.section == '5'
+    assert student.cgpa == '8.12'
+    assert student.semester_sgpa['sem2'] == '7.85'
+    assert student.backlog_count == 1
+    assert scraper.scrape_single_student_http('22B81A0599') is None
+
+
+@pytest.mark.parametrize('message', [
+    'Result not found for the given roll number',
+    'No results found',
+    'Invalid Hall Ticket Number',
+    'Student not found',
+])
+def test_portal_no_result_messages_are_recognized(message):
+    assert reports_no_result({'message': message})
+
+
+@pytest.mark.parametrize('message', ['Invalid token', '404 Not Found', 'Session expired', 'Invalid request'])
+def test_other_errors_are_not_taken_for_a_missing_result(message):
+    assert not reports_no_result({'error': message})
+
+
+def test_auth_error_is_a_fetch_failure(portal, fetcher):
+    portal.recordings['22B81A0597'] = {'status': 401, 'body': {'message': 'Invalid token'}}
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch_raw('22B81A0597')
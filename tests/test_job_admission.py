@@ -0,0 +1,39 @@
+import threading
+import time
+
+from job_admission import JobScheduler
+
+
+def test_waiting_job_heartbeats_while_other_jobs_keep_notifying():
+    scheduler = JobScheduler('scrape', max_active=1)
+    release = threading.Event()
+    beats = []
+
+    def hold_slot():
+        with scheduler.slot('running'):
+            release.wait()
+
+    def wait_for_slot():
+        with scheduler.slot('waiting', on_wait=lambda: beats.append(time.monotonic()), wait_interval=0.5):
+            pass
+
+    scheduler.enqueue('running')
+    scheduler.enqueue('waiting')
+    holder = threading.Thread(target=hold_slot)
+    waiter = threading.Thread(target=wait_for_slot)
+    holder.start()
+    waiter.start()
+
+    # Short jobs coming and going wake the waiter far more often than its heartbeat interval
+    deadline = time.monotonic() + 3
+    while time.monotonic() < deadline:
+        scheduler.enqueue('short')
+        scheduler.cancel('short')
+        time.sleep(0.2)
+
+    release.set()
+    holder.join(5)
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert len(beats) >= 4
+    assert all(later - earlier >= 0.5 for earlier, later in zip(beats, beats[1:]))
@@ -0,0 +1,85 @@
+import os
+
+from job_registry import JobRegistry
+from prepared_json import PreparedJson
+
+ACTIVE = ('queued', 'analyzing')
+
+
+def finished(size=10):
+    return {'status': 'completed', 'response': PreparedJson.from_body(b'"' + b'x' * size + b'"')}
+
+
+def spill_files(spill_dir):
+    return sorted(os.listdir(spill_dir))
+
+
+def test_least_recently_used_finished_entries_are_evicted_first():
+    evicted = []
+    registry = JobRegistry('analysis', ACTIVE, max_entries=2, on_evict=evicted.append)
+    registry['a'] = {'status': 'completed'}
+    registry['b'] = {'status': 'completed'}
+    registry['a']  # Now b is the least recently used
+    registry['c'] = {'status': 'completed'}
+
+    assert evicted == ['b']
+    assert sorted(registry) == ['a', 'c']
+
+
+def test_active_entries_are_never_evicted():
+    registry = JobRegistry('analysis', ACTIVE, max_entries=1)
+    registry['a'] = {'status': 'analyzing'}
+    registry['b'] = {'status': 'queued'}
+    registry['c'] = {'status': 'completed'}
+
+    assert sorted(registry) == ['a', 'b']
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    registry = JobRegistry('analysis', ACTIVE, ttl=60)
+    registry['a'] = {'status': 'completed'}
+    registry['b'] = {'status': 'analyzing'}
+    later = registry._last_used['a'] + 61
+    monkeypatch.setattr('job_registry.time.time', lambda: later)
+
+    assert 'a' not in registry
+    assert registry.get('a') is None
+    assert registry['b'] == {'status': 'analyzing'}
+
+
+def test_spilled_entry_round_trips(tmp_path):
+    registry = JobRegistry('analysis', ACTIVE, max_entries=1, spill_dir=str(tmp_path))
+    first = finished()
+    registry['a'] = first
+    registry['b'] = finished()
+    assert spill_files(tmp_path) == ['analysis_a.json']
+
+    restored = registry['a']
+    assert restored['status'] == 'completed'
+    assert restored['response'].body == first['response'].body
+    assert restored['response'].etag == first['response'].etag
+    # Reading a back pushed b out in its place
+    assert spill_files(tmp_path) == ['analysis_b.json']
+
+
+def test_entry_larger_than_the_byte_bound_can_still_be_read(tmp_path):
+    registry = JobRegistry('analysis', ACTIVE, max_bytes=1000, spill_dir=str(tmp_path))
+    registry['a'] = finished(5000)
+    assert spill_files(tmp_path) == ['analysis_a.json']
+
+    entry = registry.get('a')
+    assert entry is not None
+    assert len(entry['response'].body) == 5002
+
+
+def test_membership_does_not_read_spilled_entries_back(tmp_path):
+    registry = JobRegistry('analysis', ACTIVE, max_entries=1, spill_dir=str(tmp_path))
+    registry['a'] = finished()
+    registry['b'] = finished()
+    path = tmp_path / 'analysis_a.json'
+    modified = path.stat().st_mtime_ns
+
+    assert 'a' in registry
+    assert 'missing' not in registry
+    assert path.stat().st_mtime_ns == modified
+    assert sorted(registry) == ['b']
@@ -0,0 +1,41 @@
+import time
+
+from http_fetcher import HttpResultFetcher
+from job_runner import run_scrape_job
+from job_store import JobStore
+from result_writer import StreamingResultWriter, checkpoint_path_for, iter_checkpoint, job_output_path
+from scraper import StudentResultScraper
+
+ROLLS = ['22B81A0501', '22B81A0599']
+
+
+def http_scraper(portal):
+    scraper = StudentResultScraper(driver_pool=False, engine='http', result_cache=False, single_flight=False)
+    scraper._http_fetcher = HttpResultFetcher(api_url=portal.url, timeout=5)
+    return scraper
+
+
+def test_crash_before_a_student_is_saved_leaves_it_to_resume(portal, tmp_path, monkeypatch):
+    job_store = JobStore(db_path=str(tmp_path / 'jobs.db'))
+    job_store.create_job('job', ROLLS, 'results.xlsx')
+    upload_folder = str(tmp_path / 'uploads')
+
+    def crash(self, student):
+        time.sleep(0.3)  # Long enough for the scraper thread to finish the roll number
+        raise RuntimeError("process killed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(StreamingResultWriter, 'append', crash)
+        run_scrape_job(job_store, http_scraper(portal), 'job', ROLLS, 'results.xlsx', upload_folder)
+
+    assert job_store.get_job('job')['status'] == 'error'
+    assert '22B81A0501' in job_store.remaining_rolls('job')
+
+    run_scrape_job(job_store, http_scraper(portal), 'job', job_store.remaining_rolls('job'), 'results.xlsx',
+                   upload_folder, resume=True)
+
+    checkpoint = checkpoint_path_for(job_output_path(upload_folder, 'job', 'results.xlsx'))
+    assert [student.hall_ticket_number for student in iter_checkpoint(checkpoint)] == ['22B81A0501']
+    assert portal.requests.count('22B81A0501') == 2
+    assert job_store.get_job('job')['status'] == 'completed'
+    assert job_store.remaining_rolls('job') == []
@@ -0,0 +1,44 @@
+import pytest
+
+from http_fetcher import HttpResultFetcher
+from result_cache import ResultCache
+from scraper import StudentResultScraper
+
+CONFIRMED_MISSING = '22B81A0599'  # The portal answers with a "not found" message
+BARE_404 = '22B81A0500'           # No recording: a bare 404 from the proxy
+UNRECOGNIZED = '22B81A0598'       # A payload the parser does not understand
+
+
+def scraper_for(engine, cache, browser_rolls, api_url=None):
+    """Scraper whose Selenium fallback only records what it was handed"""
+    scraper = StudentResultScraper(driver_pool=False, engine=engine, result_cache=cache, single_flight=False)
+    if api_url:
+        scraper._http_fetcher = HttpResultFetcher(api_url=api_url, timeout=5)
+    drain = scraper._drain_queue
+
+    def browser_drain(roll_numbers, max_threads, on_done, drain_engine):
+        if drain_engine != 'selenium':
+            return drain(roll_numbers, max_threads, on_done, drain_engine)
+        browser_rolls.extend(roll_numbers)
+        for roll_number in roll_numbers:
+            on_done(roll_number, None)
+        return []
+
+    scraper._drain_queue = browser_drain
+    return scraper
+
+
+@pytest.mark.parametrize('engine', ['http', 'async'])
+def test_api_fetch_failures_do_not_hide_students_from_the_browser(portal, tmp_path, engine):
+    cache = ResultCache(db_path=str(tmp_path / 'cache.db'))
+    rolls = ['22B81A0501', CONFIRMED_MISSING, BARE_404, UNRECOGNIZED]
+
+    api_fallback = []
+    scraper_for(engine, cache, api_fallback, portal.url).scrape_parallel(rolls, max_threads=2)
+    assert sorted(api_fallback) == [BARE_404, UNRECOGNIZED]
+    assert cache.get_missing(rolls) == {CONFIRMED_MISSING}
+
+    # A later browser job trusts the negative cache, so only the confirmed miss is skipped
+    browser = []
+    scraper_for('selenium', cache, browser).scrape_parallel(rolls, max_threads=2)
+    assert sorted(browser) == [BARE_404, UNRECOGNIZED]
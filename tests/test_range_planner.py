@@ -0,0 +1,40 @@
+from range_planner import SeriesTracker, expand_range
+
+SERIES = expand_range('23EG106D01', '23EG106D20')
+
+
+def roll(position):
+    return SERIES[position - 1]
+
+
+def tracker_with(outcomes, miss_limit=3):
+    tracker = SeriesTracker([SERIES], miss_limit)
+    for position, found in outcomes:
+        tracker.record(roll(position), found)
+    return tracker
+
+
+def test_misses_after_the_last_found_student_end_the_series():
+    tracker = tracker_with([(4, True), (5, False), (6, False), (7, False)])
+
+    assert not tracker.should_skip(roll(7))
+    assert tracker.should_skip(roll(8))
+
+
+def test_gap_before_a_found_student_does_not_end_the_series():
+    tracker = tracker_with([(10, True), (5, False), (6, False), (7, False)])
+
+    assert not tracker.should_skip(roll(12))
+
+
+def test_student_found_past_the_stop_reopens_the_series():
+    tracker = tracker_with([(5, False), (6, False), (7, False)])
+    assert tracker.should_skip(roll(12))
+
+    tracker.record(roll(10), True)
+    assert not tracker.should_skip(roll(12))
+
+    for position in (11, 12, 13):
+        tracker.record(roll(position), False)
+    assert not tracker.should_skip(roll(13))
+    assert tracker.should_skip(roll(14))
@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from benchmark import write_synthetic_results
+from sheet_loader import load_workbook
+
+
+@pytest.fixture(scope='module')
+def export_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('exports') / 'results.xlsx')
+    write_synthetic_results(path, 50)
+    return path
+
+
+def test_streaming_read_flattens_the_export_header(export_path):
+    df = load_workbook(export_path, engine='openpyxl')
+
+    assert len(df) == 50
+    assert {'Hall Ticket Number', 'CGPA', 'Sem1 SGPA', 'Course 101_Grade', 'Course 101_Credits'} <= set(df.columns)
+    assert df['CGPA'].dtype.kind == 'f'
+    assert df['Course 101_Credits'].dtype.kind in 'if'
+
+
+def test_streaming_read_matches_whole_sheet_read(export_path):
+    pd.testing.assert_frame_equal(load_workbook(export_path, engine='openpyxl'),
+                                  load_workbook(export_path, engine=None), check_dtype=False)
+
+
+def test_calamine_matches_openpyxl(export_path):
+    pytest.importorskip('python_calamine')
+    pd.testing.assert_frame_equal(load_workbook(export_path, engine='calamine'),
+                                  load_workbook(export_path, engine='openpyxl'), check_dtype=False)
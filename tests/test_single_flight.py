@@ -0,0 +1,79 @@
+import threading
+
+import scraper as scraper_module
+from scraper import StudentResultScraper
+from single_flight import FAILED, SingleFlight
+
+
+def run_with_timeout(target, timeout=10):
+    """Run target in a thread, failing the test instead of hanging it"""
+    errors = []
+
+    def run():
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "scrape did not finish"
+    return errors
+
+
+def test_async_engine_error_fails_the_lookups_it_led(monkeypatch):
+    flights = SingleFlight()
+    scraper = StudentResultScraper(driver_pool=False, engine='async', result_cache=False, single_flight=flights)
+    followers = {}
+
+    def crashing_run(self, roll_numbers, progress_callback=None, result_callback=None, skip=None):
+        for roll_number in roll_numbers:
+            assert not skip(roll_number)  # This job leads every lookup
+            flights.claim(roll_number, followers.setdefault(roll_number, []).append)
+        raise RuntimeError("event loop died")
+
+    monkeypatch.setattr(scraper_module.AsyncResultEngine, 'run', crashing_run)
+
+    errors = run_with_timeout(lambda: scraper.scrape_parallel(['22B81A0501', '22B81A0502']))
+
+    assert [str(e) for e in errors] == ["event loop died"]
+    assert followers == {'22B81A0501': [FAILED], '22B81A0502': [FAILED]}
+    assert flights.in_flight() == 0
+
+
+def test_followed_lookup_settles_after_every_worker_retired():
+    flights = SingleFlight()
+    assert flights.claim('22B81A0599', lambda outcome: None)  # Another job is fetching it
+
+    scraper = StudentResultScraper(driver_pool=False, engine='selenium', result_cache=False, single_flight=flights)
+    drivers = iter([object()])
+
+    def create_driver():
+        driver = next(drivers, None)
+        if driver is None:
+            raise RuntimeError("chrome unavailable")
+        return driver
+
+    def failing_attempt(roll_number, driver, attempt=1):
+        raise RuntimeError("browser crashed")
+
+    retire = scraper._retire_worker
+
+    def retire_then_leader_gives_up(work, on_done, state, state_lock):
+        retire(work, on_done, state, state_lock)
+        if state['live_workers'] == 0:
+            flights.finish('22B81A0599', FAILED)
+
+    scraper._create_driver = create_driver
+    scraper._scrape_attempt = failing_attempt
+    scraper._driver_alive = lambda driver: False
+    scraper._close_driver = lambda driver, pool, discard=False: None
+    scraper._retire_worker = retire_then_leader_gives_up
+
+    settled = []
+    errors = run_with_timeout(lambda: scraper.scrape_parallel(['22B81A0599', '22B81A0501'], max_threads=1,
+                                                              roll_callback=settled.append))
+
+    assert not errors
+    assert settled == ['22B81A0501', '22B81A0599']
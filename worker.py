@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Scrape worker for Student Result Analysis System
+Runs scrape jobs queued by the web app when it is started with SCRAPE_MODE=queue.
+Start it on the host serving the app with as many processes as its cores and memory
+allow: the job store is SQLite in WAL mode, which can't be shared over a network filesystem.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+# Add current directory to Python path
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+logger = logging.getLogger('worker')
+
+LOG_FORMAT = '%(asctime)s %(processName)s %(levelname)s %(message)s'
+
+
+def work(poll_interval: float, upload_folder: str):
+    """Claim and run jobs one at a time until the process is stopped"""
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    from job_store import JobStore
+    from job_runner import run_claimed_job
+
+    os.makedirs(upload_folder, exist_ok=True)
+    job_store = JobStore()
+    logger.info(f"Worker {job_store.owner} waiting for jobs")
+
+    while True:
+        try:
+            # Jobs abandoned by a crashed worker come first: their users have waited longest
+            stale = job_store.claim_stale_jobs(limit=1)
+            job, resume = (stale[0], True) if stale else (job_store.claim_next_job(), False)
+            if job is None:
+                time.sleep(poll_interval)
+                continue
+
+            logger.info(f"{'Resuming' if resume else 'Starting'} job {job['id']} ({job['total']} roll numbers)")
+            run_claimed_job(job_store, job, upload_folder, resume)
+            logger.info(f"Job {job['id']} finished")
+        except Exception as e:
+            logger.error(f"Worker error: {str(e)}")
+            time.sleep(poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=int(os.environ.get('SCRAPE_WORKERS', 2)),
+                        help='Worker processes to run, each with its own Chrome driver pool (default: 2)')
+    parser.add_argument('--poll-interval', type=float, default=2,
+                        help='Seconds between queue checks while idle')
+    parser.add_argument('--upload-folder', default=os.environ.get('UPLOAD_FOLDER', 'uploads'),
+                        help='Folder where checkpoints and Excel files are written')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    # Treat SIGTERM from a process manager like Ctrl+C so workers are stopped too
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    # Spawn rather than fork: Chrome drivers and SQLite connections must not be shared
+    context = multiprocessing.get_context('spawn')
+
+    def start(index):
+        process = context.Process(target=work, args=(args.poll_interval, args.upload_folder),
+                                  name=f"scrape-worker-{index}", daemon=True)
+        process.start()
+        return process
+
+    processes = [start(i) for i in range(args.processes)]
+    logger.info(f"Started {len(processes)} scrape worker process(es)")
+
+    try:
+        while True:
+            # Replace any worker that died; its job is resumed once its heartbeat goes stale
+            for i, process in enumerate(processes):
+                if not process.is_alive():
+                    logger.warning(f"{process.name} exited with code {process.exitcode}, restarting")
+                    processes[i] = start(i)
+            time.sleep(5)
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Stopping scrape workers")
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+if __name__ == '__main__':
+    main()